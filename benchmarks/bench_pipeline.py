@@ -0,0 +1,347 @@
+"""
+Throughput and memory benchmarks for the log pipeline.
+
+Runs LogFilter (ignore-list filtering, keyword detection, templating),
+HistoryManager (load, duplicate checks, inserts), LogCollector (file
+tailing) and LogScanner (full-file scans) against a seeded synthetic
+corpus (see corpus.py), and compares the results with stored baselines.
+Exits non-zero on a regression, so it can gate CI:
+
+    python benchmarks/bench_pipeline.py                    # compare with baselines.json
+    python benchmarks/bench_pipeline.py --update-baseline  # record new baselines
+    python benchmarks/bench_pipeline.py --lines 2000000 --ignore-sizes 0,100,5000 --only filter
+
+Baselines are only comparable between runs with the same parameters on
+the same machine; re-record them when either changes. Each result is
+compared with its tolerance stored in the baseline file; benchmarks
+without one there use TOLERANCES (or --tolerance), which also seeds the
+file when a baseline is recorded. Edit the file to change the gate.
+
+Every benchmark group runs in `--processes` fresh interpreters and the
+best result is kept: on shared (virtualized) machines a whole process can
+run 30-40% slower than the next, which no amount of in-process repetition
+averages out.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import generate_corpus, generate_ignore_patterns  # noqa: E402
+from src.collector import LogCollector  # noqa: E402
+from src.correlator import parse_timestamp  # noqa: E402
+from src.filter import LogFilter  # noqa: E402
+from src.history import HistoryManager  # noqa: E402
+from src.scanner import LogScanner  # noqa: E402
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+
+
+# Default allowed relative regression per benchmark (prefix match, longest
+# wins) for benchmarks without a tolerance in the baseline file; the rest
+# use --tolerance. In four full runs against the recorded
+# baseline (best of three processes each) no result fell more than 15%
+# below it; disk- and subprocess-bound benchmarks get extra headroom.
+TOLERANCES = {
+    "filter.": 0.4,           # one big allocation per run, sensitive to memory pressure
+    "history.add_entry": 0.5, # rewrites a file on every insert, bound by the disk
+    "tail.": 0.5,             # subprocess (tail) and page cache bound
+}
+
+
+def tolerance_for(name, default, tolerances=TOLERANCES):
+    matches = [prefix for prefix in tolerances if name.startswith(prefix)]
+    return tolerances[max(matches, key=len)] if matches else default
+
+
+def measure(func, repeat, min_time=1.0, max_runs=50):
+    """
+    Best wall time of at least `repeat` runs (short benchmarks keep running
+    for `min_time` seconds to smooth out noise), then peak traced memory of
+    one more run. Like timeit, the garbage collector is off while timing,
+    so collections triggered by earlier benchmarks' objects do not count.
+    """
+    best = float("inf")
+    runs, total = 0, 0.0
+    gc.collect()
+    gc.disable()
+    try:
+        while runs < repeat or (total < min_time and runs < max_runs):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            best = min(best, elapsed)
+            runs += 1
+            total += elapsed
+    finally:
+        gc.enable()
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak / (1024 * 1024)
+
+
+def make_filter(patterns):
+    log_filter = LogFilter.__new__(LogFilter)  # skip loading ignore_patterns.json
+    log_filter.ignore_patterns = patterns
+    return log_filter
+
+
+def corpus_file(ctx, clean=False):
+    """
+    The benchmark corpus (only benign lines with `clean`) in the shared
+    temporary directory, generated by the first process that needs it.
+    """
+    path = os.path.join(ctx["tmpdir"], "clean_corpus.log" if clean else "corpus.log")
+    if not os.path.exists(path):
+        start = time.perf_counter()
+        text = generate_corpus(ctx["lines"], noise=1.0 if clean else ctx["noise"], seed=ctx["seed"], fmt=ctx["format"])
+        with open(path, "w") as f:
+            f.write(text)
+        print(f"{'clean ' if clean else ''}corpus: {ctx['lines']} lines, {len(text) / (1024 * 1024):.1f} MiB "
+              f"(generated in {time.perf_counter() - start:.1f}s)", file=sys.stderr)
+    return path
+
+
+def corpus(ctx, clean=False):
+    key = "clean_corpus" if clean else "corpus"
+    if key not in ctx:
+        with open(corpus_file(ctx, clean)) as f:
+            ctx[key] = f.read()
+    return ctx[key]
+
+
+def bench_filter(ctx):
+    results = {}
+    text = corpus(ctx)
+    for size in ctx["ignore_sizes"]:
+        log_filter = make_filter(generate_ignore_patterns(size, seed=ctx["seed"]))
+        seconds, peak = measure(lambda: log_filter.filter_logs(text), ctx["repeat"])
+        results[f"filter.ignore_{size}"] = (ctx["lines"] / seconds, "lines/s", peak)
+    return results
+
+
+def bench_keywords(ctx):
+    log_filter = make_filter([])
+    lines = corpus(ctx).splitlines()
+    clean = corpus(ctx, clean=True)
+    results = {}
+    # Worst case for the whole-text check: no keyword anywhere, so it scans everything
+    seconds, peak = measure(lambda: log_filter.contains_keywords(clean), ctx["repeat"])
+    results["keywords.scan_clean"] = (ctx["lines"] / seconds, "lines/s", peak)
+    # Per-line pre-screen, as the syslog listener does
+    seconds, peak = measure(lambda: [line for line in lines if log_filter.contains_keywords(line)], ctx["repeat"])
+    results["keywords.per_line"] = (ctx["lines"] / seconds, "lines/s", peak)
+    return results
+
+
+def bench_template(ctx):
+    lines = corpus(ctx).splitlines()[:100000]
+    seconds, peak = measure(lambda: [LogFilter.template(line) for line in lines], ctx["repeat"])
+    return {"template": (len(lines) / seconds, "lines/s", peak)}
+
+
+def bench_history(ctx):
+    rng = random.Random(ctx["seed"])
+    entries = ctx["history_entries"]
+    now = datetime.now()
+    texts = [f"finding {i} {rng.getrandbits(64):016x}" for i in range(entries)]
+    history_file = os.path.join(ctx["tmpdir"], "history.json")
+    manager = HistoryManager(history_file)
+    manager.history = {"history": [{
+        "id": manager._get_hash(text),
+        "timestamp": (now - timedelta(minutes=i)).isoformat(),
+        "severity": "warning",
+        "summary": text,
+    } for i, text in enumerate(texts)]}
+    manager.save()
+
+    results = {}
+    seconds, peak = measure(lambda: HistoryManager(history_file), ctx["repeat"])
+    results["history.load"] = (entries / seconds, "entries/s", peak)
+
+    manager = HistoryManager(history_file)
+    lookups = [rng.choice(texts) if rng.random() < 0.5 else f"new finding {i}" for i in range(10000)]
+    seconds, peak = measure(lambda: [manager.is_duplicate(text) for text in lookups], ctx["repeat"])
+    results["history.is_duplicate"] = (len(lookups) / seconds, "ops/s", peak)
+
+    # Every insert rewrites the history file, so this scales with its size
+    inserts = 20
+    seconds, peak = measure(lambda: [manager.add_entry(f"insert {i}", "warning", "bench") for i in range(inserts)], 1, min_time=0)
+    results["history.add_entry"] = (inserts / seconds, "ops/s", peak)
+    return results
+
+
+def bench_tail(ctx):
+    path = corpus_file(ctx)
+    results = {}
+    for lines in (50, 5000):
+        runs = 20
+        seconds, peak = measure(lambda: [LogCollector.get_file_logs(path, lines) for _ in range(runs)], ctx["repeat"])
+        results[f"tail.lines_{lines}"] = (runs / seconds, "ops/s", peak)
+    # Keyword pre-screen (predicate pushdown): last 50 matching lines, read backwards
+    keywords = LogFilter.TRIGGER_KEYWORDS
+    seconds, peak = measure(lambda: LogCollector.get_file_logs(path, 50, keywords=keywords), ctx["repeat"])
+    results["tail.matching_50"] = (1 / seconds, "ops/s", peak)
+    # Time-window lookup (two binary searches over the memory-mapped file)
+    text = corpus(ctx)
+    since, until = parse_timestamp(text[:64]), parse_timestamp(text[-200:].splitlines()[-1])
+    middle = (since + until) / 2
+    seconds, peak = measure(lambda: LogCollector.time_range(path, middle, middle + 900), ctx["repeat"])
+    results["tail.time_range"] = (1 / seconds, "ops/s", peak)
+    return results
+
+
+def bench_scan(ctx):
+    path = corpus_file(ctx)
+    keywords = LogFilter.TRIGGER_KEYWORDS
+    results = {}
+    # In-process, then the process pool on all CPUs (same as the first on a single core)
+    for name, workers in (("scan.serial", 1), ("scan.parallel", os.cpu_count() or 1)):
+        scanner = LogScanner(workers)
+        scanner.MIN_PARALLEL_BYTES = 0
+        seconds, peak = measure(lambda: scanner.scan(path, keywords), ctx["repeat"])
+        results[name] = (ctx["lines"] / seconds, "lines/s", peak)
+    return results
+
+
+BENCHMARKS = {
+    "filter": bench_filter,
+    "keywords": bench_keywords,
+    "template": bench_template,
+    "history": bench_history,
+    "tail": bench_tail,
+    "scan": bench_scan,
+}
+
+
+def allowed_regression(name, stored, default):
+    """The tolerance stored in the baseline file, else the one from TOLERANCES / --tolerance."""
+    return stored[name] if name in stored else tolerance_for(name, default)
+
+
+def compare(results, baseline, stored, tolerance):
+    """Returns the names of results that regressed against `baseline` beyond their tolerance."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        allowed = allowed_regression(name, stored, tolerance)
+        slower = result["throughput"] < base["throughput"] * (1 - allowed)
+        # Small absolute slack, allocator noise dominates tiny peaks
+        bigger = result["peak_mb"] > base["peak_mb"] * (1 + allowed) + 1
+        if slower or bigger:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Logix pipeline benchmarks")
+    parser.add_argument("--lines", type=int, default=200000, help="Corpus size in lines")
+    parser.add_argument("--noise", type=float, default=0.98, help="Share of benign lines in the corpus")
+    parser.add_argument("--seed", type=int, default=42, help="Corpus random seed")
+    parser.add_argument("--format", choices=["syslog", "journal"], default="syslog", help="Corpus line format")
+    parser.add_argument("--ignore-sizes", default="0,10,100", help="Comma-separated ignore-list sizes to filter with")
+    parser.add_argument("--history-entries", type=int, default=10000, help="Entries in the benchmarked history file")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per benchmark (best is kept)")
+    parser.add_argument("--only", help=f"Comma-separated subset of: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="Baseline file")
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.35, help="Allowed relative regression for benchmarks without a tolerance in the baseline file or TOLERANCES (default 0.35)")
+    parser.add_argument("--processes", type=int, default=3, help="Fresh processes each benchmark group runs in (best is kept)")
+    # Internal: run one group in this process and print its results as JSON
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        ctx = dict(lines=args.lines, noise=args.noise, seed=args.seed, format=args.format,
+                   ignore_sizes=[int(s) for s in args.ignore_sizes.split(",")],
+                   history_entries=args.history_entries, repeat=args.repeat, tmpdir=args.workdir)
+        print(json.dumps(BENCHMARKS[args.worker](ctx)))
+        return
+
+    params = {
+        "lines": args.lines, "noise": args.noise, "seed": args.seed, "format": args.format,
+        "ignore_sizes": args.ignore_sizes, "history_entries": args.history_entries,
+    }
+    selected = args.only.split(",") if args.only else list(BENCHMARKS)
+    unknown = [name for name in selected if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    worker = [sys.executable, os.path.abspath(__file__), "--lines", str(args.lines), "--noise", str(args.noise),
+              "--seed", str(args.seed), "--format", args.format, "--ignore-sizes", args.ignore_sizes,
+              "--history-entries", str(args.history_entries), "--repeat", str(args.repeat)]
+    results = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # In the order of BENCHMARKS, whatever order --only lists them in
+        for name in sorted(selected, key=list(BENCHMARKS).index):
+            for _ in range(max(1, args.processes)):
+                output = subprocess.run(worker + ["--worker", name, "--workdir", tmpdir],
+                                        stdout=subprocess.PIPE, text=True, check=True).stdout
+                for result_name, (throughput, unit, peak) in json.loads(output.splitlines()[-1]).items():
+                    best = results.get(result_name)
+                    if best is None or throughput > best["throughput"]:
+                        results[result_name] = {"throughput": round(throughput, 1), "unit": unit, "peak_mb": round(peak, 2)}
+
+    baseline = {}
+    stored = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            stored = json.load(f)
+        if stored.get("params") == params:
+            baseline = stored.get("results", {})
+        elif not args.update_baseline:
+            print("note: baseline was recorded with different parameters, not comparing")
+    # Tolerances do not depend on the parameters; edited ones survive re-recording
+    tolerances = stored.get("tolerances", {})
+
+    print(f"\n{'benchmark':28} {'throughput':>16} {'':9} {'peak MiB':>9} {'vs baseline':>12} {'allowed':>8}")
+    for name, result in results.items():
+        base = baseline.get(name)
+        delta = f"{100 * (result['throughput'] / base['throughput'] - 1):+.0f}%" if base else "-"
+        allowed = f"-{allowed_regression(name, tolerances, args.tolerance):.0%}"
+        print(f"{name:28} {result['throughput']:16,.0f} {result['unit']:9} {result['peak_mb']:9.2f} {delta:>12} {allowed:>8}")
+
+    if args.update_baseline:
+        # Keep results of benchmarks not run this time (e.g. with --only)
+        if stored.get("params") == params:
+            results = dict(stored.get("results", {}), **results)
+        with open(args.baseline, "w") as f:
+            json.dump({
+                "recorded": datetime.now().isoformat(timespec="seconds"),
+                "machine": f"{platform.machine()} {platform.processor() or ''}".strip(),
+                "python": platform.python_version(),
+                "params": params,
+                "tolerances": {name: allowed_regression(name, tolerances, args.tolerance) for name in results},
+                "results": results,
+            }, f, indent=2)
+        print(f"\nbaseline written to {args.baseline}")
+        sys.exit(0)
+
+    regressions = compare(results, baseline, tolerances, args.tolerance)
+    if regressions:
+        print(f"\nFAIL: regression beyond the allowed tolerance in: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Startup benchmark for Logix.
+
+Measures how long it takes to import the CLI and to run a trivial mode
+(--show-ignored) in a fresh interpreter, and checks that heavy dependencies
+are not imported eagerly. Exits non-zero on a regression, so it can gate CI:
+
+    python benchmarks/bench_startup.py --budget-ms 250
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules only specific modes need; importing src.main must not pull them in
+HEAVY_MODULES = ["openai", "psutil", "requests", "smtplib", "sqlite3", "rich.prompt", "dotenv"]
+
+
+def time_command(argv, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(argv, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def eager_heavy_imports():
+    code = (
+        "import sys, src.main; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return [m for m in result.stdout.strip().split(",") if m]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Logix startup benchmark")
+    parser.add_argument("--runs", type=int, default=7, help="Runs per measurement (median is reported)")
+    parser.add_argument("--budget-ms", type=float, default=250, help="Fail if `import src.main` takes longer (median)")
+    args = parser.parse_args()
+
+    baseline = time_command([sys.executable, "-c", "pass"], args.runs)
+    import_ms = time_command([sys.executable, "-c", "import src.main"], args.runs) - baseline
+    show_ms = time_command([sys.executable, "-m", "src.main", "--show-ignored"], args.runs) - baseline
+    eager = eager_heavy_imports()
+
+    print(f"interpreter baseline     {baseline:8.1f} ms")
+    print(f"import src.main          {import_ms:8.1f} ms (budget {args.budget_ms:.0f} ms)")
+    print(f"logix --show-ignored     {show_ms:8.1f} ms")
+    print(f"eager heavy imports      {', '.join(eager) or 'none'}")
+
+    failed = False
+    if import_ms > args.budget_ms:
+        print("FAIL: import time over budget")
+        failed = True
+    if eager:
+        print("FAIL: heavy modules imported at startup")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Seeded generator of synthetic syslog / journal corpora for the benchmarks.
+
+The same seed and parameters always produce the same corpus, so numbers
+from different runs (and machines) are comparable. Lines look like the
+ones Logix reads from /var/log/syslog or `journalctl -o short-iso`: mostly
+benign noise, with a configurable share of error/warning messages.
+
+    python benchmarks/corpus.py --lines 1000000 --noise 0.99 --format journal -o /tmp/journal.log
+"""
+import argparse
+import random
+import string
+import sys
+import time
+
+HOSTS = ["web01", "web02", "db01", "worker03", "edge-gw"]
+
+# Benign messages; none contain a Logix trigger keyword
+NOISE_TEMPLATES = [
+    ("systemd", "Started Session {n} of user {user}."),
+    ("systemd", "Starting {unit}..."),
+    ("systemd", "Finished {unit}."),
+    ("systemd-logind", "New session {n} of user {user}."),
+    ("CRON", "({user}) CMD (/usr/lib/{unit}/run --quiet)"),
+    ("sshd", "Accepted publickey for {user} from {ip} port {port} ssh2: ED25519 SHA256:{hex}"),
+    ("sshd", "pam_unix(sshd:session): session opened for user {user}(uid={n}) by (uid=0)"),
+    ("NetworkManager", "<info>  [{ts}] dhcp4 (eth0): state changed bound -> bound"),
+    ("kernel", "[{ts}] audit: type=1400 audit({ts}:{n}): apparmor=\"STATUS\" profile=\"{unit}\" pid={pid}"),
+    ("dockerd", "time=\"{iso}\" level=info msg=\"Container {hex} health check ok\""),
+    ("nginx", "{ip} - - \"GET /api/v1/items/{n} HTTP/1.1\" 200 {n} \"-\" \"curl/8.5.0\""),
+    ("postgres", "LOG:  checkpoint complete: wrote {n} buffers ({ts}%); 0 WAL file(s) added"),
+    ("rsyslogd", "[origin software=\"rsyslogd\"] rsyslogd was HUPed"),
+]
+
+# Messages worth reporting; all but the OOM kill contain a trigger keyword
+ERROR_TEMPLATES = [
+    ("kernel", "[{ts}] EXT4-fs error (device sda{d}): ext4_find_entry:{n}: inode #{n}: comm {unit}: reading directory lblock 0"),
+    ("kernel", "[{ts}] ata{d}.00: failed command: READ FPDMA QUEUED"),
+    ("kernel", "[{ts}] Out of memory: Killed process {pid} ({unit}) total-vm:{n}kB"),
+    ("sshd", "error: maximum authentication attempts exceeded for root from {ip} port {port} ssh2"),
+    ("sshd", "Failed password for invalid user {user} from {ip} port {port} ssh2"),
+    ("systemd", "{unit}.service: Main process exited, code=exited, status={d}/FAILURE"),
+    ("systemd", "{unit}.service: Failed with result 'exit-code'."),
+    ("nginx", "[error] {pid}#{pid}: *{n} connect() failed (111: Connection refused) while connecting to upstream"),
+    ("postgres", "FATAL:  password authentication failed for user \"{user}\""),
+    ("dockerd", "time=\"{iso}\" level=warning msg=\"Health check for container {hex} failed\""),
+    ("python3", "Traceback (most recent call last): RuntimeError exception in worker {n}"),
+    ("smartd", "Device: /dev/sda [SAT], {n} Currently unreadable (pending) sectors, critical"),
+]
+
+USERS = ["root", "deploy", "alice", "bob", "backup", "www-data"]
+UNITS = ["apt-daily", "logrotate", "certbot", "snapd", "docker", "fstrim", "man-db", "backup-job"]
+
+
+_FIELDS = {
+    "n": lambda rng, epoch: rng.randint(1, 99999),
+    "d": lambda rng, epoch: rng.randint(0, 9),
+    "pid": lambda rng, epoch: rng.randint(100, 65535),
+    "port": lambda rng, epoch: rng.randint(1024, 65535),
+    "user": lambda rng, epoch: rng.choice(USERS),
+    "unit": lambda rng, epoch: rng.choice(UNITS),
+    "ip": lambda rng, epoch: f"10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}",
+    "hex": lambda rng, epoch: f"{rng.getrandbits(64):016x}",
+    "ts": lambda rng, epoch: f"{rng.randint(1, 99999)}.{rng.randint(0, 999999):06d}",
+    "iso": lambda rng, epoch: time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(epoch)),
+}
+
+
+_TEMPLATE_FIELDS = {}
+
+
+def _fill(template: str, rng: random.Random, epoch: float) -> str:
+    # Only draws the fields the template uses (in a fixed order, so the
+    # output depends on the seed alone), which keeps generation fast
+    names = _TEMPLATE_FIELDS.get(template)
+    if names is None:
+        names = _TEMPLATE_FIELDS[template] = list(dict.fromkeys(
+            name for _, name, _, _ in string.Formatter().parse(template) if name))
+    return template.format(**{name: _FIELDS[name](rng, epoch) for name in names})
+
+
+def generate_lines(lines: int, noise: float = 0.98, seed: int = 42, fmt: str = "syslog",
+                   start: float = 1700000000.0, rate: float = 50.0, error_templates=None):
+    """
+    Yields `lines` log lines. `noise` is the share of benign lines, `rate`
+    the average lines per second (timestamps increase monotonically), and
+    `fmt` either 'syslog' (RFC 3164 style) or 'journal' (short-iso).
+    """
+    rng = random.Random(seed)
+    errors = error_templates or ERROR_TEMPLATES
+    stamp_format = "%Y-%m-%dT%H:%M:%S+0000" if fmt == "journal" else "%b %d %H:%M:%S"
+    epoch = start
+    second, stamp = None, None
+    for _ in range(lines):
+        epoch += rng.expovariate(rate)
+        app, template = rng.choice(NOISE_TEMPLATES if rng.random() < noise else errors)
+        host = rng.choice(HOSTS)
+        if int(epoch) != second:
+            second = int(epoch)
+            stamp = time.strftime(stamp_format, time.gmtime(second))
+        pid = "" if app == "kernel" else f"[{rng.randint(100, 65535)}]"
+        yield f"{stamp} {host} {app}{pid}: {_fill(template, rng, epoch)}"
+
+
+def generate_corpus(lines: int, **kwargs) -> str:
+    return "\n".join(generate_lines(lines, **kwargs)) + "\n"
+
+
+def generate_ignore_patterns(count: int, seed: int = 42):
+    """
+    Builds an ignore list of `count` substrings. A few match real noise (as
+    users' lists do); the rest are specific strings that never match, so
+    every line is tested against the full list.
+    """
+    rng = random.Random(seed)
+    matching = ["rsyslogd was HUPed", "health check ok", "dhcp4 (eth0): state changed bound -> bound"]
+    patterns = matching[:count]
+    while len(patterns) < count:
+        patterns.append(f"{rng.choice(UNITS)}[{rng.randint(100, 65535)}]: ignored message {rng.getrandbits(32):08x}")
+    return patterns
+
+
+def write_corpus(path: str, lines: int, **kwargs):
+    with open(path, "w") as f:
+        for line in generate_lines(lines, **kwargs):
+            f.write(line + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic syslog/journal corpus")
+    parser.add_argument("--lines", type=int, default=100000, help="Number of lines")
+    parser.add_argument("--noise", type=float, default=0.98, help="Share of benign lines (0-1)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--format", choices=["syslog", "journal"], default="syslog", help="Timestamp/line format")
+    parser.add_argument("-o", "--output", help="Output file (default: stdout)")
+    args = parser.parse_args()
+
+    if args.output:
+        write_corpus(args.output, args.lines, noise=args.noise, seed=args.seed, fmt=args.format)
+    else:
+        for line in generate_lines(args.lines, noise=args.noise, seed=args.seed, fmt=args.format):
+            sys.stdout.write(line + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -60,13 +60,19 @@ class LogAnalyzer:
                 "findings": []
             }
 
-    def analyze_health(self, specs: dict, metrics: dict, logs: str, model: str) -> dict:
+    def analyze_health(self, specs: dict, metrics: dict, logs: str, model: str, correlations: list = None) -> dict:
         """
         Analyzes system health metrics and logs to diagnose performance issues.
+        When `correlations` (ranked spike/log-event pairs) are given they replace
+        the raw log dump in the prompt.
         """
         system_prompt = """
         You are an expert System Performance Analyst. 
         Your task is to analyze the provided system specifications, real-time metrics, and recent logs to diagnose lag, crashes, or bottlenecks.
+        The metrics contain only the windows a local detector flagged as anomalous ("anomalies"), each with a few
+        surrounding samples for context, plus a summary of the whole monitoring period.
+        If "correlated_events" is present, each entry pairs a metric spike with the log lines logged around it,
+        ranked by likely relevance; use these to explain what caused each spike.
         
         Output your analysis in valid JSON format with the following structure:
         {
@@ -84,11 +90,15 @@ class LogAnalyzer:
         }
         """
 
-        data_payload = json.dumps({
+        payload = {
             "system_specs": specs,
             "performance_metrics": metrics,
-            "recent_logs": logs
-        }, indent=2)
+        }
+        if correlations is not None:
+            payload["correlated_events"] = correlations
+        else:
+            payload["recent_logs"] = logs
+        data_payload = json.dumps(payload, indent=2)
 
         try:
             response = self.client.chat.completions.create(
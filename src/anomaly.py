@@ -0,0 +1,143 @@
+import math
+from collections import deque
+from typing import Dict, List, Any, Optional
+
+
+class EWMAStat:
+    """
+    Exponentially weighted mean/variance for a single metric.
+    Each update is O(1) and keeps no sample history.
+    """
+    __slots__ = ("alpha", "mean", "var", "count")
+
+    def __init__(self, alpha: float = 0.3):
+        self.alpha = alpha
+        self.mean = None
+        self.var = 0.0
+        self.count = 0
+
+    def score(self, value: float) -> float:
+        """Returns the z-score of `value` against the current baseline."""
+        if self.mean is None:
+            return 0.0
+        std = math.sqrt(self.var)
+        # Floor the deviation so a perfectly flat baseline does not turn
+        # a 0.5% wobble into an infinite z-score.
+        return (value - self.mean) / max(std, 1.0)
+
+    def update(self, value: float, clip: Optional[float] = None):
+        """
+        Folds `value` into the baseline. With `clip`, outliers are winsorized
+        to mean +/- clip*std first, so a spike does not inflate the variance
+        and mask the samples that follow it.
+        """
+        self.count += 1
+        if self.mean is None:
+            self.mean = value
+            return
+        if clip is not None and self.count > 1:
+            bound = clip * max(math.sqrt(self.var), 1.0)
+            value = min(max(value, self.mean - bound), self.mean + bound)
+        diff = value - self.mean
+        incr = self.alpha * diff
+        self.mean += incr
+        self.var = (1 - self.alpha) * (self.var + diff * incr)
+
+
+class AnomalyDetector:
+    """
+    Streaming anomaly detector over SystemMonitor samples.
+
+    Every sample is scored against an EWMA baseline per metric (and against
+    hard limits), in constant time. Consecutive anomalous samples are grouped
+    into windows together with `context` samples before and after, so only
+    those windows need to be sent to the LLM.
+    """
+    METRICS = ["cpu_percent", "memory_percent", "load_1m"]
+    # Absolute ceilings that are anomalous no matter what the baseline says
+    # (a machine pinned at 100% CPU quickly becomes its own baseline).
+    HARD_LIMITS = {"cpu_percent": 95.0, "memory_percent": 90.0}
+
+    def __init__(self, alpha: float = 0.3, threshold: float = 3.0, warmup: int = 3, context: int = 2):
+        self.threshold = threshold
+        self.warmup = warmup
+        self.context = context
+        self.stats = {metric: EWMAStat(alpha) for metric in self.METRICS}
+        self._recent = deque(maxlen=context)
+        self._open: Optional[Dict[str, Any]] = None
+        self._trailing = 0
+        self._closed: List[Dict[str, Any]] = []
+
+    @staticmethod
+    def _values(sample: Dict[str, Any]) -> Dict[str, float]:
+        values = {
+            "cpu_percent": sample.get("cpu_percent"),
+            "memory_percent": sample.get("memory_percent"),
+        }
+        load_avg = sample.get("load_avg")
+        if load_avg:
+            values["load_1m"] = load_avg[0]
+        return {k: float(v) for k, v in values.items() if v is not None}
+
+    def check(self, sample: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Scores a sample without updating the baseline.
+        Returns a list of reasons (empty if the sample looks normal).
+        """
+        reasons = []
+        for metric, value in self._values(sample).items():
+            limit = self.HARD_LIMITS.get(metric)
+            if limit is not None and value >= limit:
+                reasons.append({"metric": metric, "value": value, "limit": limit})
+                continue
+
+            stat = self.stats[metric]
+            if stat.count < self.warmup:
+                continue
+            z = stat.score(value)
+            if abs(z) >= self.threshold:
+                reasons.append({"metric": metric, "value": value, "baseline": round(stat.mean, 2), "zscore": round(z, 2)})
+        return reasons
+
+    def observe(self, sample: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Feeds one sample into the detector. Returns the anomaly reasons for it.
+        """
+        reasons = self.check(sample)
+        for metric, value in self._values(sample).items():
+            stat = self.stats[metric]
+            stat.update(value, clip=self.threshold if stat.count >= self.warmup else None)
+
+        if reasons:
+            if self._open is None:
+                self._open = {
+                    "start": sample.get("timestamp"),
+                    "end": sample.get("timestamp"),
+                    "samples": list(self._recent),
+                    "reasons": [],
+                }
+            self._open["end"] = sample.get("timestamp")
+            self._open["samples"].append(dict(sample, anomalous=True))
+            self._open["reasons"].extend(reasons)
+            self._trailing = self.context
+        elif self._open is not None:
+            self._open["samples"].append(sample)
+            self._trailing -= 1
+            if self._trailing <= 0:
+                self._close()
+
+        self._recent.append(sample)
+        return reasons
+
+    def _close(self):
+        if self._open is not None:
+            self._closed.append(self._open)
+            self._open = None
+            self._trailing = 0
+
+    def get_windows(self) -> List[Dict[str, Any]]:
+        """Returns all anomalous windows seen so far, including an open one."""
+        windows = list(self._closed)
+        if self._open is not None:
+            windows.append(self._open)
+        return windows
@@ -0,0 +1,163 @@
+import glob
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+from rich.console import Console
+from src.collector import CollectorError, LogCollector
+from src.profiler import profiler
+
+console = Console()
+
+# Files larger than this are not sent to the model
+MAX_FILE_BYTES = 256 * 1024
+
+
+def _is_text_file(path: str) -> bool:
+    try:
+        with open(path, "rb") as f:
+            return b"\0" not in f.read(4096)
+    except OSError:
+        return False
+
+
+def expand_config_targets(targets: List[str]) -> List[str]:
+    """
+    Expands files, directories (recursively) and glob patterns into a sorted
+    list of unique regular text files. Hidden files and directories found
+    while walking are skipped; explicitly named files are always kept.
+    """
+    paths = []
+    for target in targets:
+        if glob.has_magic(target):
+            matches = glob.glob(os.path.expanduser(target), recursive=True)
+        else:
+            matches = [os.path.expanduser(target)]
+
+        for match in matches:
+            if os.path.isdir(match):
+                for root, dirs, files in os.walk(match):
+                    dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+                    paths.extend(os.path.join(root, name) for name in files if not name.startswith("."))
+            else:
+                paths.append(match)
+
+    unique = {}
+    for path in paths:
+        real = os.path.realpath(path)
+        if real not in unique and os.path.isfile(real):
+            unique[real] = path
+    return sorted(path for path in unique.values() if _is_text_file(path))
+
+
+class ConfigManifest:
+    """
+    Content hashes of audited config files with the outcome of their last
+    audit. A file whose content, model and prompt are unchanged since a
+    clean audit does not need to be sent to the model again.
+    """
+    def __init__(self, manifest_file="data/config_manifest.json"):
+        self.manifest_file = manifest_file
+        self.entries = self.load()
+
+    @staticmethod
+    def digest(content: str) -> str:
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def load(self):
+        if not os.path.exists(self.manifest_file):
+            return {}
+        try:
+            with open(self.manifest_file, 'r') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return {}
+
+    def save(self):
+        directory = os.path.dirname(self.manifest_file)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        with open(self.manifest_file, 'w') as f:
+            json.dump(self.entries, f, indent=2)
+
+    def is_clean(self, path: str, sha256: str, model: str, prompt: Optional[str]) -> bool:
+        entry = self.entries.get(os.path.realpath(path))
+        return bool(entry) and not entry["has_issues"] and entry["sha256"] == sha256 \
+            and entry["model"] == model and entry["prompt"] == prompt
+
+    def record(self, path: str, sha256: str, model: str, prompt: Optional[str], has_issues: bool):
+        self.entries[os.path.realpath(path)] = {
+            "sha256": sha256,
+            "model": model,
+            "prompt": prompt,
+            "has_issues": has_issues,
+            "audited": datetime.now().isoformat(),
+        }
+
+
+class ConfigAuditor:
+    """
+    Audits many configuration files concurrently. Each file is one
+    `analyze_config` request, so a small thread pool overlaps the network
+    round trips; files unchanged since their last clean audit are skipped.
+    """
+    def __init__(self, analyzer, model: str, prompt: Optional[str] = None, jobs: int = 4,
+                 manifest: Optional[ConfigManifest] = None, force: bool = False):
+        self.analyzer = analyzer
+        self.model = model
+        self.prompt = prompt
+        self.jobs = max(1, jobs)
+        self.manifest = manifest or ConfigManifest()
+        self.force = force
+
+    def _audit_file(self, path: str) -> Dict[str, Any]:
+        result = {"path": path, "has_issues": False, "summary": "", "findings": []}
+        try:
+            size = os.path.getsize(path)
+        except OSError as e:
+            return dict(result, status="error", summary=f"Error reading file {path}: {e}")
+        if size > MAX_FILE_BYTES:
+            return dict(result, status="skipped", summary=f"File too large to audit ({size // 1024} KiB)")
+
+        with profiler.span("read", path=path) as span:
+            content = LogCollector.read_file(path)
+            span.output(content)
+        if isinstance(content, CollectorError):
+            return dict(result, status="error", summary=content)
+
+        sha256 = ConfigManifest.digest(content)
+        if not self.force and self.manifest.is_clean(path, sha256, self.model, self.prompt):
+            return dict(result, status="unchanged", summary="Unchanged since last clean audit.", sha256=sha256)
+
+        with profiler.span("analyze", data=content, path=path) as span:
+            analysis = self.analyzer.analyze_config(content, path, self.model, self.prompt)
+            span.output(findings=len(analysis.get("findings", [])))
+        return dict(result, status="audited", sha256=sha256,
+                    has_issues=analysis.get("has_issues", False),
+                    summary=analysis.get("summary", "Analysis complete."),
+                    findings=analysis.get("findings", []))
+
+    def audit(self, paths: List[str]) -> List[Dict[str, Any]]:
+        """Returns one result per path (in input order) and updates the manifest."""
+        results = {}
+        with console.status(f"[bold green]Auditing {len(paths)} configuration file(s) with AI...") as status:
+            with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+                futures = {pool.submit(self._audit_file, path): path for path in paths}
+                for future in as_completed(futures):
+                    path = futures[future]
+                    try:
+                        results[path] = future.result()
+                    except Exception as e:
+                        results[path] = {"path": path, "status": "error", "has_issues": False,
+                                         "summary": str(e), "findings": []}
+                    status.update(f"[bold green]Auditing configuration files with AI... "
+                                  f"({len(results)}/{len(paths)})")
+
+        with profiler.span("manifest"):
+            for result in results.values():
+                if result["status"] == "audited":
+                    self.manifest.record(result["path"], result["sha256"], self.model, self.prompt, result["has_issues"])
+            self.manifest.save()
+        return [results[path] for path in paths]
@@ -1,34 +1,115 @@
+import mmap
 import subprocess
 import os
+import re
+from datetime import datetime
 from pathlib import Path
+from typing import List, Optional, Tuple
+from src.correlator import parse_timestamp
+
+class CollectorError(str):
+    """
+    An "Error..." message returned by a collector instead of log lines, so
+    callers can tell it apart from log content that starts with "Error".
+    """
+
 
 class LogCollector:
+    # Whether journalctl supports --grep (built with PCRE2); probed on first use
+    journal_grep = None
+    # How much of a file the keyword pre-screen reads backwards at most
+    MAX_SCAN_BYTES = 64 * 1024 * 1024
+    SCAN_BLOCK = 1024 * 1024
+
     @staticmethod
-    def get_journal_logs(lines: int = 50) -> str:
+    def get_journal_logs(lines: int = 50, since: float = None, output: str = None, until: float = None,
+                         priority: str = None, units: List[str] = None, keywords: List[str] = None) -> str:
         """
         Retrieves the last N lines from system journal.
+        `since`/`until` (unix epoch) bound the entries in time; `output` is
+        passed to journalctl -o (e.g. 'short-iso' for sortable timestamps).
+        `priority`, `units` and `keywords` are evaluated by journalctl
+        itself, so the N lines are the last N that match them.
         """
+        # -n: lines, --no-pager: stdout
+        command = ["journalctl", "-n", str(lines), "--no-pager"]
+        if since is not None:
+            command += ["--since", f"@{int(since)}"]
+        if until is not None:
+            command += ["--until", f"@{int(until)}"]
+        if output:
+            command += ["-o", output]
+        if priority:
+            command += ["-p", priority]
+        for unit in units or []:
+            command += ["-u", unit]
+
+        if keywords and LogCollector.journal_grep is False:
+            return LogCollector._prescreen_journal(lines, since, output, until, priority, units, keywords)
+        grep = bool(keywords)
+        if grep:
+            # An all-lowercase pattern makes journalctl match case-insensitively
+            command += ["--grep", "|".join(re.escape(k.lower()) for k in keywords)]
+
         try:
-            # -n: lines, --no-pager: stdout
-            command = ["journalctl", "-n", str(lines), "--no-pager"]
             result = subprocess.run(command, capture_output=True, text=True, check=True)
+            if grep:
+                LogCollector.journal_grep = True
             return result.stdout
         except subprocess.CalledProcessError as e:
-            return f"Error retrieving journal logs: {e.stderr}"
+            if grep and "pattern matching" in e.stderr:
+                LogCollector.journal_grep = False
+                return LogCollector._prescreen_journal(lines, since, output, until, priority, units, keywords)
+            if grep and e.returncode == 1 and "-- No entries --" in e.stdout:
+                # --grep exits with 1 when nothing matched
+                LogCollector.journal_grep = True
+                return e.stdout
+            return CollectorError(f"Error retrieving journal logs: {e.stderr}")
         except FileNotFoundError:
-            return "Error: journalctl command not found. Are you on a system with systemd?"
+            return CollectorError("Error: journalctl command not found. Are you on a system with systemd?")
 
     @staticmethod
-    def get_file_logs(filepath: str, lines: int = 50) -> str:
+    def _prescreen_journal(lines, since, output, until, priority, units, keywords) -> str:
+        """Fallback for journalctl without --grep (no PCRE2): fetch more, keep keyword lines."""
+        logs = LogCollector.get_journal_logs(max(lines * 20, 1000), since, output, until, priority, units)
+        if isinstance(logs, CollectorError):
+            return logs
+        keywords = [k.lower() for k in keywords]
+        matching = [line for line in logs.splitlines() if any(k in line.lower() for k in keywords)]
+        return "\n".join(matching[-lines:])
+
+    @staticmethod
+    def get_file_logs(filepath: str, lines: int = 50, keywords: List[str] = None, exclude: List[str] = None,
+                      since: float = None, until: float = None) -> str:
         """
         Retrieves the last N lines from a specific log file.
+        With `keywords`, only the last N lines containing one of them (and
+        none of the `exclude` substrings) are returned; see tail_matching.
+        `since`/`until` (unix epochs) limit the lines to that time window.
         """
         path = Path(filepath)
         if not path.exists():
-            return f"Error: File {filepath} not found."
+            return CollectorError(f"Error: File {filepath} not found.")
         
         if not path.is_file():
-             return f"Error: {filepath} is not a file."
+             return CollectorError(f"Error: {filepath} is not a file.")
+
+        if since is not None or until is not None:
+            try:
+                start, end = LogCollector.time_range(filepath, since, until)
+                # The window is chosen explicitly, so it is read in full
+                return LogCollector.tail_matching(filepath, lines, keywords, exclude,
+                                                  max_scan_bytes=end - start, start=start, end=end)
+            except ValueError as e:
+                return CollectorError(f"Error: {e}.")
+            except OSError as e:
+                return CollectorError(f"Error reading file {filepath}: {e}")
+
+        if keywords:
+            try:
+                return LogCollector.tail_matching(filepath, lines, keywords, exclude)
+            except OSError as e:
+                return CollectorError(f"Error reading file {filepath}: {e}")
 
         try:
             # Using tail to get last N lines efficiently
@@ -42,7 +123,154 @@ class LogCollector:
                     content = f.readlines()
                     return "".join(content[-lines:])
             except Exception as e2:
-                 return f"Error reading file {filepath}: {e} | {e2}"
+                 return CollectorError(f"Error reading file {filepath}: {e} | {e2}")
+
+    @staticmethod
+    def tail_matching(filepath: str, lines: int, keywords: List[str] = None, exclude: List[str] = None,
+                      max_scan_bytes: int = None, start: int = 0, end: int = None) -> str:
+        """
+        Reads a file backwards in blocks and returns its last `lines` lines
+        that contain a keyword (case-insensitive; any line if `keywords` is
+        empty) and no `exclude` substring. Only bytes [start, end) are read,
+        which must be line-aligned (see time_range). Stops after
+        `max_scan_bytes` (default MAX_SCAN_BYTES), so a quiet multi-GB log
+        costs a bounded read instead of a full pass.
+        """
+        if keywords:
+            pattern = re.compile(b"|".join(re.escape(k.lower().encode("utf-8")) for k in keywords))
+        else:
+            pattern = re.compile(b"^", re.M)
+        excluded = [e.encode("utf-8") for e in exclude or [] if e]
+        budget = LogCollector.MAX_SCAN_BYTES if max_scan_bytes is None else max_scan_bytes
+        matches = []
+
+        with open(filepath, "rb") as f:
+            position = f.seek(0, os.SEEK_END) if end is None else end
+            stop = max(start, position - budget)
+            carry = b""
+            while position > stop and len(matches) < lines:
+                size = min(LogCollector.SCAN_BLOCK, position - stop)
+                position -= size
+                f.seek(position)
+                block = f.read(size) + carry
+                lowered = block.lower() if keywords else block
+
+                # The first line of the block may be cut; keep it for the next block
+                offset = 0
+                if position > start:
+                    offset = block.find(b"\n") + 1
+                    carry = block[:offset - 1] if offset else block
+                    if not offset:
+                        continue
+
+                # Let the regex engine find keyword hits, then expand each to its line
+                found = []
+                while offset < len(block):
+                    match = pattern.search(lowered, offset)
+                    if not match:
+                        break
+                    line_start = lowered.rfind(b"\n", 0, match.start()) + 1
+                    line_end = lowered.find(b"\n", match.end())
+                    line_end = len(block) if line_end == -1 else line_end
+                    line = block[line_start:line_end]
+                    if line and not any(e in line for e in excluded):
+                        found.append(line)
+                    offset = line_end + 1
+                matches.extend(reversed(found))
+            del matches[lines:]
+
+        if not matches:
+            return ""
+        return b"\n".join(reversed(matches)).decode("utf-8", "replace") + "\n"
+
+    # Below this many bytes the timestamp search switches to a linear scan
+    SEARCH_WINDOW = 4 * 1024
+
+    @staticmethod
+    def _line_timestamp(mm, position: int, now) -> Optional[float]:
+        return parse_timestamp(mm[position:position + 64].split(b"\n", 1)[0].decode("utf-8", "replace"), now)
+
+    # Bytes at each end of a file checked for timestamps before a search
+    TIMESTAMP_SAMPLE = 64 * 1024
+
+    @staticmethod
+    def _has_timestamps(mm, now) -> bool:
+        """True if a line near the end or the start of `mm` has a timestamp parse_timestamp reads."""
+        size = len(mm)
+        tail = size - LogCollector.TIMESTAMP_SAMPLE
+        # The tail starts at the first full line inside it
+        tail = mm.find(b"\n", tail) + 1 if tail > 0 else 0
+        for position, stop in ((tail or size, size), (0, min(size, LogCollector.TIMESTAMP_SAMPLE))):
+            while position < stop:
+                if LogCollector._line_timestamp(mm, position, now) is not None:
+                    return True
+                newline = mm.find(b"\n", position, stop)
+                if newline == -1:
+                    break
+                position = newline + 1
+        return False
+
+    @staticmethod
+    def find_offset(mm, target: float, now, strict: bool = False) -> int:
+        """
+        Byte offset of the first line whose timestamp is >= `target` (> with
+        `strict`), or the size of `mm` if there is none. Binary search over
+        byte offsets, assuming timestamps are (roughly) in order; lines
+        without a timestamp belong to the line before them.
+        """
+        after = (lambda ts: ts > target) if strict else (lambda ts: ts >= target)
+        # All lines before `lo` (a line start) are before the target
+        lo, hi = 0, len(mm)
+        while hi - lo > LogCollector.SEARCH_WINDOW:
+            mid = (lo + hi) // 2
+            newline = mm.find(b"\n", mid, hi)
+            if newline == -1:
+                break
+            position, ts = newline + 1, None
+            # Skip continuation lines (tracebacks etc.) up to the next timestamp
+            while position < hi:
+                ts = LogCollector._line_timestamp(mm, position, now)
+                if ts is not None:
+                    break
+                newline = mm.find(b"\n", position, hi)
+                position = hi if newline == -1 else newline + 1
+            if ts is None or after(ts):
+                hi = mid
+            else:
+                lo = position
+
+        # Linear scan over the remaining window
+        position = lo
+        while position < len(mm):
+            ts = LogCollector._line_timestamp(mm, position, now)
+            if ts is not None and after(ts):
+                return position
+            newline = mm.find(b"\n", position)
+            if newline == -1:
+                break
+            position = newline + 1
+        return len(mm)
+
+    @staticmethod
+    def time_range(filepath: str, since: float = None, until: float = None) -> Tuple[int, int]:
+        """
+        Line-aligned byte range [start, end) of the entries logged between
+        `since` and `until` (unix epochs, either may be None). The file is
+        memory-mapped, so each bound costs O(log n) page reads. Raises
+        ValueError if no line near either end of the file has a timestamp.
+        """
+        with open(filepath, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return 0, 0
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # One reference time, so year-less syslog stamps resolve consistently
+                now = datetime.now()
+                if not LogCollector._has_timestamps(mm, now):
+                    raise ValueError(f"no parseable timestamps in {filepath}; --since/--until unsupported")
+                start = 0 if since is None else LogCollector.find_offset(mm, since, now)
+                end = size if until is None else LogCollector.find_offset(mm, until, now, strict=True)
+        return start, max(start, end)
 
     @staticmethod
     def read_file(filepath: str) -> str:
@@ -51,9 +279,9 @@ class LogCollector:
         """
         path = Path(filepath)
         if not path.exists():
-            return f"Error: File {filepath} not found."
+            return CollectorError(f"Error: File {filepath} not found.")
         
         try:
             return path.read_text(encoding='utf-8')
         except Exception as e:
-            return f"Error reading file {filepath}: {str(e)}"
+            return CollectorError(f"Error reading file {filepath}: {str(e)}")
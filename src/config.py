@@ -1,44 +1,52 @@
 import os
 import json
+from functools import lru_cache
 from pathlib import Path
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-# Logic to check multiple locations for .env
-_env_paths = [
-    Path.cwd() / ".env",                          # 1. Current directory
-    Path.home() / ".config" / "logix" / ".env",   # 2. XDG Config
-    Path.home() / ".logix" / ".env",              # 3. Dotfolder in home
-    Path(__file__).parent.parent / ".env"         # 4. Source root (for dev)
-]
-
-_loaded_path = None
-for _path in _env_paths:
-    if _path.exists():
-        load_dotenv(dotenv_path=_path)
-        _loaded_path = _path
-        break
-
-# Fallback if nothing specific found
-if not _loaded_path:
-    load_dotenv()
-
-class Config:
-    OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
+
+
+def _config_dirs():
+    return [
+        Path.cwd(),                                   # 1. Current directory
+        Path.home() / ".config" / "logix",            # 2. XDG Config
+        Path.home() / ".logix",                       # 3. Dotfolder in home
+        Path(__file__).parent.parent                  # 4. Source root (for dev)
+    ]
+
+
+def _env_paths():
+    return [d / ".env" for d in _config_dirs()]
+
+
+@lru_cache(maxsize=None)
+def find_config_file(name: str):
+    """
+    Returns the first existing `name` in the standard config directories
+    (or None). Cached, so each location is probed at most once per process.
+    """
+    for directory in _config_dirs():
+        path = directory / name
+        if path.exists():
+            return path
+    return None
+
+
+class _LazyConfig(type):
+    """
+    Defers .env / user_logs.json discovery until a setting is first read,
+    so modes that never touch configuration (e.g. --show-ignored) skip it.
+    """
+    def __getattr__(cls, name):
+        # Only reached for attributes that are not set yet
+        if name.startswith("__") or cls._loaded:
+            raise AttributeError(name)
+        cls._load()
+        return getattr(cls, name)
+
+
+class Config(metaclass=_LazyConfig):
     OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
-    DEFAULT_MODEL = os.getenv("DEFAULT_MODEL", "google/gemini-2.0-flash-001")
-    
-    # Notification Config
-    DISCORD_WEBHOOK_URL = os.getenv("DISCORD_WEBHOOK_URL")
-    
-    SMTP_SERVER = os.getenv("SMTP_SERVER")
-    SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
-    SMTP_USER = os.getenv("SMTP_USER")
-    SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
-    SMTP_FROM = os.getenv("SMTP_FROM")
-    SMTP_TO = os.getenv("SMTP_TO")
-
-    COMMON_LOGS = {
+
+    DEFAULT_LOGS = {
         "System Journal": "journalctl",
         "Syslog": "/var/log/syslog",
         "Auth Log": "/var/log/auth.log",
@@ -47,32 +55,96 @@ class Config:
         "Package Manager (dpkg)": "/var/log/dpkg.log",
         "Xorg Log": "/var/log/Xorg.0.log",
     }
-    
-    # Load user defined logs
-    # Check standard config directories
-    _config_dirs = [
-        Path.cwd(),
-        Path.home() / ".config" / "logix",
-        Path.home() / ".logix",
-        Path(__file__).parent.parent
-    ]
 
-    for _dir in _config_dirs:
-        _user_logs_path = _dir / "user_logs.json"
-        if _user_logs_path.exists():
+    _loaded = False
+
+    @classmethod
+    def _load(cls, override: bool = False):
+        from dotenv import load_dotenv
+
+        # Load environment variables from the first .env found
+        env_path = find_config_file(".env")
+        if env_path:
+            load_dotenv(dotenv_path=env_path, override=override)
+        else:
+            # Fallback if nothing specific found
+            load_dotenv()
+
+        cls.OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
+        cls.DEFAULT_MODEL = os.getenv("DEFAULT_MODEL", "google/gemini-2.0-flash-001")
+
+        # Notification Config
+        cls.DISCORD_WEBHOOK_URL = os.getenv("DISCORD_WEBHOOK_URL")
+
+        cls.SMTP_SERVER = os.getenv("SMTP_SERVER")
+        cls.SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+        cls.SMTP_USER = os.getenv("SMTP_USER")
+        cls.SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
+        cls.SMTP_FROM = os.getenv("SMTP_FROM")
+        cls.SMTP_TO = os.getenv("SMTP_TO")
+
+        # Cron notifications are coalesced into one digest per run (or per window
+        # in seconds, if set); these severities are still sent immediately.
+        cls.DIGEST_WINDOW = int(os.getenv("LOGIX_DIGEST_WINDOW", "0"))
+        cls.DIGEST_IMMEDIATE = [s.strip() for s in os.getenv("LOGIX_DIGEST_IMMEDIATE", "critical").split(",") if s.strip()]
+
+        # Durable queue notifications are written to before delivery
+        cls.OUTBOX_FILE = os.getenv("LOGIX_OUTBOX_FILE", "data/outbox.db")
+
+        # Seconds a fix command may run before it is stopped
+        cls.FIX_TIMEOUT = int(os.getenv("LOGIX_FIX_TIMEOUT", "300"))
+
+        # Metrics recorder (--record) ring file; default capacity is 24h at 5s
+        cls.METRICS_FILE = os.getenv("LOGIX_METRICS_FILE", "data/metrics.ring")
+        cls.METRICS_CAPACITY = int(os.getenv("LOGIX_METRICS_CAPACITY", "17280"))
+
+        # Which log sources exist on this host, re-probed after the TTL (seconds)
+        cls.SOURCE_PROBE_FILE = os.getenv("LOGIX_SOURCE_PROBE_FILE", "data/source_probe.json")
+        cls.SOURCE_PROBE_TTL = int(os.getenv("LOGIX_SOURCE_PROBE_TTL", "3600"))
+
+        # Daemon mode: default check interval and random jitter per source, in seconds
+        cls.DAEMON_INTERVAL = int(os.getenv("LOGIX_DAEMON_INTERVAL", "300"))
+        cls.DAEMON_JITTER = int(os.getenv("LOGIX_DAEMON_JITTER", "30"))
+
+        # Load user defined logs from the first user_logs.json found.
+        # A value is either a source spec (file, 'journalctl', glob of rotated files,
+        # 'cmd:<command>', 'docker:<container>', 'syslog://...') or
+        # {"path": <spec>, "interval": ..., "jitter": ...}.
+        cls.COMMON_LOGS = dict(cls.DEFAULT_LOGS)
+        cls.SOURCE_SCHEDULE = {}
+        user_logs_path = find_config_file("user_logs.json")
+        if user_logs_path:
             try:
-                with open(_user_logs_path, "r") as f:
-                    _user_logs = json.load(f)
-                    if isinstance(_user_logs, dict):
-                        COMMON_LOGS.update(_user_logs)
-                break # Stop after finding the first valid config
+                with open(user_logs_path, "r") as f:
+                    user_logs = json.load(f)
+                    if isinstance(user_logs, dict):
+                        for name, spec in user_logs.items():
+                            if isinstance(spec, dict):
+                                if "path" not in spec:
+                                    print(f"Warning: Skipping source {name!r} in {user_logs_path}: no \"path\"")
+                                    continue
+                                cls.COMMON_LOGS[name] = spec["path"]
+                                cls.SOURCE_SCHEDULE[name] = {k: spec[k] for k in ("interval", "jitter") if k in spec}
+                            else:
+                                cls.COMMON_LOGS[name] = spec
             except Exception as e:
-                print(f"Warning: Failed to load user_logs.json from {_user_logs_path}: {e}")
+                print(f"Warning: Failed to load user_logs.json from {user_logs_path}: {e}")
+
+        cls._loaded = True
+
+    @classmethod
+    def reload(cls):
+        """
+        Re-discovers and re-reads configuration (e.g. after files changed).
+        Values from the .env file win over the ones loaded previously.
+        """
+        find_config_file.cache_clear()
+        cls._load(override=True)
 
     @staticmethod
     def validate():
         if not Config.OPENROUTER_API_KEY:
-            paths_str = "\n".join([f"  - {p}" for p in _env_paths])
+            paths_str = "\n".join([f"  - {p}" for p in _env_paths()])
             raise ValueError(
                 f"OPENROUTER_API_KEY not found in environment variables.\n"
                 f"Checked the following locations for a .env file:\n{paths_str}\n\n"
@@ -0,0 +1,133 @@
+import re
+import datetime
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Any, Optional
+
+# 2026-10-19T10:22:01.123+0200 / 2026-10-19 10:22:01 (journalctl -o short-iso, RFC5424, app logs)
+_ISO_RE = re.compile(r"(\d{4}-\d{2}-\d{2})[T ](\d{2}:\d{2}:\d{2})(\.\d+)?(Z|[+-]\d{2}:?\d{2})?")
+# Oct 19 10:22:01 (classic syslog / journalctl short)
+_SYSLOG_RE = re.compile(r"^([A-Z][a-z]{2}) +(\d{1,2}) (\d{2}):(\d{2}):(\d{2})")
+_MONTHS = {m: i for i, m in enumerate(
+    ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"], 1)}
+
+
+def parse_timestamp(line: str, now: Optional[datetime.datetime] = None) -> Optional[float]:
+    """
+    Extracts the timestamp of a log line as a unix epoch.
+    Returns None if the line has no recognizable timestamp.
+    Syslog timestamps carry no year; the current one is assumed, rolling
+    back a year for dates that would otherwise lie in the future.
+    """
+    match = _SYSLOG_RE.match(line)
+    if match:
+        month = _MONTHS.get(match.group(1))
+        if month is None:
+            return None
+        now = now or datetime.datetime.now()
+        try:
+            ts = datetime.datetime(now.year, month, int(match.group(2)),
+                                   int(match.group(3)), int(match.group(4)), int(match.group(5)))
+        except ValueError:
+            return None
+        if ts > now + datetime.timedelta(days=1):
+            ts = ts.replace(year=now.year - 1)
+        return ts.timestamp()
+
+    match = _ISO_RE.search(line, 0, 64)
+    if match:
+        # Before Python 3.11 fromisoformat takes exactly 3 or 6 fractional
+        # digits; Docker and RFC 5424 stamps can carry up to 9
+        fraction = match.group(3)[:7].ljust(7, "0") if match.group(3) else ""
+        text = f"{match.group(1)}T{match.group(2)}{fraction}"
+        tz = match.group(4)
+        if tz:
+            tz = "+00:00" if tz == "Z" else (tz if ":" in tz else f"{tz[:3]}:{tz[3:]}")
+            text += tz
+        try:
+            return datetime.datetime.fromisoformat(text).timestamp()
+        except ValueError:
+            return None
+    return None
+
+
+class LogCorrelator:
+    """
+    Joins log events to anomalous metric windows by time.
+
+    Log lines are parsed and sorted once; each window is then resolved with
+    two binary searches over the sorted timestamps, so correlating W windows
+    against N lines costs O(N log N + W log N).
+    """
+    def __init__(self, keywords: List[str], margin: int = 30, max_events: int = 10):
+        self.keywords = [k.lower() for k in keywords]
+        self.margin = margin
+        self.max_events = max_events
+
+    def _index(self, logs: str):
+        events = []
+        for line in logs.splitlines():
+            ts = parse_timestamp(line)
+            if ts is not None:
+                events.append((ts, line))
+        events.sort(key=lambda e: e[0])
+        return [e[0] for e in events], [e[1] for e in events]
+
+    @staticmethod
+    def _bounds(window: Dict[str, Any]):
+        epochs = [s["epoch"] for s in window.get("samples", []) if s.get("anomalous") and "epoch" in s]
+        if not epochs:
+            return None
+        return min(epochs), max(epochs)
+
+    @staticmethod
+    def _magnitude(window: Dict[str, Any]) -> float:
+        magnitude = 0.0
+        for reason in window.get("reasons", []):
+            if "zscore" in reason:
+                magnitude = max(magnitude, abs(reason["zscore"]))
+            elif "limit" in reason:
+                magnitude = max(magnitude, 3.0 * reason["value"] / reason["limit"])
+        return magnitude
+
+    def correlate(self, windows: List[Dict[str, Any]], logs: str) -> List[Dict[str, Any]]:
+        """
+        Returns "spike at T with these log events" pairs, most relevant first.
+        Windows without any nearby log events are still returned (ranked last)
+        so the LLM knows the spike had no logged cause.
+        """
+        times, lines = self._index(logs)
+        pairs = []
+
+        for window in windows:
+            bounds = self._bounds(window)
+            if bounds is None:
+                continue
+            start, end = bounds
+            lo = bisect_left(times, start - self.margin)
+            hi = bisect_right(times, end + self.margin)
+
+            events = []
+            error_count = 0
+            for i in range(lo, hi):
+                is_error = any(k in lines[i].lower() for k in self.keywords)
+                error_count += is_error
+                # Errors first, then the ones closest to the spike
+                distance = 0.0 if start <= times[i] <= end else min(abs(times[i] - start), abs(times[i] - end))
+                events.append((not is_error, distance, lines[i]))
+            events.sort(key=lambda e: (e[0], e[1]))
+
+            magnitude = self._magnitude(window)
+            metrics = sorted({r["metric"] for r in window.get("reasons", [])})
+            pairs.append({
+                "spike_start": datetime.datetime.fromtimestamp(start).isoformat(timespec="seconds"),
+                "spike_end": datetime.datetime.fromtimestamp(end).isoformat(timespec="seconds"),
+                "metrics": metrics,
+                "peak_deviation": round(magnitude, 2),
+                "error_events": error_count,
+                "total_events": hi - lo,
+                "events": [e[2] for e in events[:self.max_events]],
+                "score": round(magnitude * (1 + error_count), 2),
+            })
+
+        pairs.sort(key=lambda p: p["score"], reverse=True)
+        return pairs
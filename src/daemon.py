@@ -0,0 +1,160 @@
+import heapq
+import random
+import signal
+import threading
+import time
+from typing import Dict
+from rich.console import Console
+from src.config import Config
+from src.filter import LogFilter
+from src.syslog_server import is_syslog_source
+
+console = Console()
+
+class LogixDaemon:
+    """
+    Resident scheduler that checks each log source on its own interval.
+
+    Unlike cron mode, the analyzer client (and its HTTPS connection pool),
+    the ignore-list filter, the history index and the notification
+    dispatcher stay in memory between checks. Syslog listener sources run
+    on their own threads and feed the same pipeline. SIGHUP reloads configuration
+    and the ignore list; SIGTERM/SIGINT finish the current check, flush
+    pending notifications and exit.
+    """
+    def __init__(self, args, log_filter: LogFilter, process_source, create_digest, create_listener):
+        self.args = args
+        self.log_filter = log_filter
+        # Pipeline entry points from src.main, passed in to avoid a circular import
+        self.process_source = process_source
+        self.create_digest = create_digest
+        self.create_listener = create_listener
+        # Scheduled checks and listener batches share the analyzer/history/digest
+        self._pipeline_lock = threading.Lock()
+        self._listeners = []
+        self._wake = threading.Event()
+        self._stop = False
+        self._reload = False
+        self._queue = []   # heap of (next_run, name)
+        self._sources: Dict[str, str] = {}
+
+    def _schedule_for(self, name: str):
+        spec = Config.SOURCE_SCHEDULE.get(name, {})
+        return spec.get("interval", Config.DAEMON_INTERVAL), spec.get("jitter", Config.DAEMON_JITTER)
+
+    def _next_run(self, name: str, now: float) -> float:
+        interval, jitter = self._schedule_for(name)
+        return now + max(1.0, interval + random.uniform(-jitter, jitter))
+
+    def _build_schedule(self, sources: Dict[str, str]):
+        """(Re)builds the run queue, keeping next-run times of sources that still exist."""
+        now = time.time()
+        planned = {name: when for when, name in self._queue}
+        # Listener sources push their own batches and are never polled
+        self._sources = {name: path for name, path in sources.items() if not is_syslog_source(path)}
+        self._queue = []
+        for name in self._sources:
+            _, jitter = self._schedule_for(name)
+            # New sources start staggered instead of all at once
+            when = planned.get(name, now + random.uniform(0, jitter))
+            self._queue.append((when, name))
+        heapq.heapify(self._queue)
+
+    def _on_signal(self, signum, frame):
+        if signum == getattr(signal, "SIGHUP", None):
+            self._reload = True
+        else:
+            self._stop = True
+        self._wake.set()
+
+    def _make_analyzer(self):
+        from src.analyzer import LogAnalyzer
+        return LogAnalyzer(Config.OPENROUTER_API_KEY, Config.OPENROUTER_BASE_URL)
+
+    def _do_reload(self, sources: Dict[str, str], analyzer):
+        console.print("[bold cyan]SIGHUP received, reloading configuration...[/bold cyan]")
+        api_key = Config.OPENROUTER_API_KEY
+        Config.reload()
+        self.log_filter.reload()
+        if self.args.model_from_config and self.args.model != Config.DEFAULT_MODEL:
+            self.args.model = Config.DEFAULT_MODEL
+            console.print(f"[dim]Model changed to {self.args.model}[/dim]")
+        if self.args.source == "all":
+            from src.sources import SourceRegistry
+            registry = SourceRegistry(Config.SOURCE_PROBE_FILE, Config.SOURCE_PROBE_TTL)
+            sources, _ = registry.available(Config.COMMON_LOGS, refresh=True)
+        self._build_schedule(sources)
+        if Config.OPENROUTER_API_KEY != api_key:
+            analyzer = self._make_analyzer()
+        return analyzer
+
+    def _start_listeners(self, sources: Dict[str, str], **pipeline):
+        for name, path in sources.items():
+            if not is_syslog_source(path):
+                continue
+            receiver = self.create_listener(name, path, self.args, self.log_filter, lock=self._pipeline_lock, **pipeline)
+            thread = threading.Thread(target=receiver.run, name=f"logix-syslog-{name}", daemon=True)
+            thread.start()
+            self._listeners.append((receiver, thread))
+            console.print(f"[dim]Listening for syslog on {path} ({name})[/dim]")
+
+    def _stop_listeners(self):
+        for receiver, thread in self._listeners:
+            receiver.stop()
+            thread.join(receiver.batch_interval + 5)
+        self._listeners = []
+
+    def run(self, sources: Dict[str, str]):
+        from src.history import HistoryManager
+
+        signal.signal(signal.SIGTERM, self._on_signal)
+        signal.signal(signal.SIGINT, self._on_signal)
+        if hasattr(signal, "SIGHUP"):
+            signal.signal(signal.SIGHUP, self._on_signal)
+
+        analyzer = self._make_analyzer()
+        history = HistoryManager()
+        history.prune()
+        digest = self.create_digest()
+        self._build_schedule(sources)
+        # Listeners are started once; a SIGHUP does not rebind their sockets
+        self._start_listeners(sources, digest=digest, analyzer=analyzer, history=history)
+
+        console.print(f"[bold green]Logix daemon started[/bold green] [dim]({len(self._sources)} source(s))[/dim]")
+        try:
+            while not self._stop:
+                if self._reload:
+                    self._reload = False
+                    analyzer = self._do_reload(sources, analyzer)
+
+                # Listener batches leave findings buffered until their window passes
+                if digest.window and digest.due():
+                    with self._pipeline_lock:
+                        digest.flush()
+
+                delay = self._queue[0][0] - time.time() if self._queue else None
+                if delay is None or delay > 0:
+                    # Sleeps until the next source or digest is due, or a signal arrives;
+                    # with a window, at most that long, as listeners may open a digest meanwhile
+                    waits = [d for d in (delay, digest.time_left(), digest.window or None) if d is not None]
+                    self._wake.wait(min(waits) if waits else None)
+                    self._wake.clear()
+                    continue
+
+                _, name = heapq.heappop(self._queue)
+                try:
+                    with self._pipeline_lock:
+                        self.process_source(name, self._sources[name], self.args, self.log_filter,
+                                            digest=digest, analyzer=analyzer, history=history)
+                except Exception as e:
+                    console.print(f"[bold red]Check of {name} failed:[/bold red] {e}")
+                heapq.heappush(self._queue, (self._next_run(name, time.time()), name))
+
+                # Without a digest window, deliver (and retry the outbox) after every check
+                if not Config.DIGEST_WINDOW or digest.due():
+                    digest.flush()
+        finally:
+            console.print("[bold yellow]Shutting down, flushing notifications...[/bold yellow]")
+            self._stop_listeners()
+            digest.flush()
+            digest.dispatcher.close()
@@ -1,8 +1,20 @@
 import json
 import os
+import re
 from typing import List
 from pathlib import Path
 
+# Variable parts of a log line, replaced in order when building its template
+_TEMPLATE_SUBS = [
+    (re.compile(r"^([A-Z][a-z]{2} +\d{1,2} \d{2}:\d{2}:\d{2}|\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}\S*)\s+"), ""),
+    (re.compile(r"\[\d+\]"), "[<pid>]"),
+    (re.compile(r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b", re.I), "<uuid>"),
+    (re.compile(r"\b\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?\b"), "<ip>"),
+    (re.compile(r"\b0x[0-9a-f]+\b|\b[0-9a-f]{12,}\b", re.I), "<hex>"),
+    (re.compile(r"\d+(?:\.\d+)?"), "<n>"),
+]
+
+
 class LogFilter:
     IGNORE_FILE = "ignore_patterns.json"
     # Keywords that trigger analysis if found in logs (case-insensitive checks usually)
@@ -20,6 +32,10 @@ class LogFilter:
         except (json.JSONDecodeError, IOError):
             return []
 
+    def reload(self):
+        """Re-reads the ignore list from disk."""
+        self.ignore_patterns = self._load_patterns()
+
     def save_patterns(self):
         try:
             with open(self.IGNORE_FILE, 'w') as f:
@@ -64,3 +80,14 @@ class LogFilter:
             
         logs_lower = logs.lower()
         return any(keyword in logs_lower for keyword in self.TRIGGER_KEYWORDS)
+
+    @staticmethod
+    def template(line: str) -> str:
+        """
+        Reduces a log line to its template: timestamp removed and variable
+        parts (pids, numbers, addresses, ids) replaced by placeholders, so
+        recurrences of the same message compare equal.
+        """
+        for pattern, replacement in _TEMPLATE_SUBS:
+            line = pattern.sub(replacement, line)
+        return line.strip()
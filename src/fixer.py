@@ -1,39 +1,206 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import signal
 import subprocess
+import threading
+import time
+from datetime import datetime
 from rich.console import Console
 from rich.prompt import Confirm
+from src.filter import LogFilter
 
 console = Console()
 
+class FixOutcomes:
+    """
+    Remembers how each fix went, keyed by the fingerprint of the log line it
+    was suggested for, so fixes that worked before can be offered again
+    without another analysis round trip.
+    """
+    def __init__(self, outcomes_file="data/fix_outcomes.json"):
+        self.outcomes_file = outcomes_file
+        self.outcomes = self.load()
+
+    @staticmethod
+    def fingerprint(log_entry: str) -> str:
+        """Hash of the template of the first line of a log entry."""
+        first_line = next((line for line in log_entry.splitlines() if line.strip()), "")
+        return hashlib.sha256(LogFilter.template(first_line).encode('utf-8')).hexdigest()
+
+    def load(self):
+        if not os.path.exists(self.outcomes_file):
+            return {}
+        try:
+            with open(self.outcomes_file, 'r') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return {}
+
+    def save(self):
+        directory = os.path.dirname(self.outcomes_file)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        with open(self.outcomes_file, 'w') as f:
+            json.dump(self.outcomes, f, indent=2)
+
+    def record(self, fingerprint: str, command: str, description: str, result: dict):
+        entry = {
+            "command": command,
+            "description": description,
+            "status": result["status"],
+            "returncode": result["returncode"],
+            "duration": round(result["duration"], 2),
+            "timestamp": datetime.now().isoformat(),
+        }
+        self.outcomes.setdefault(fingerprint, []).append(entry)
+        self.save()
+
+    def known_fix(self, fingerprint: str):
+        """
+        Returns the most recent successful fix for a fingerprint (with a
+        `successes` count), or None if nothing has worked for it yet.
+        """
+        successes = [e for e in self.outcomes.get(fingerprint, []) if e["status"] == "success"]
+        if not successes:
+            return None
+        return dict(successes[-1], successes=len(successes))
+
+
 class Fixer:
+    DEFAULT_TIMEOUT = 300   # seconds
+    KILL_GRACE = 5          # seconds between SIGTERM and SIGKILL
+    # 'sudo ' without options at the start of a command or after ; & | (
+    _SUDO_PREFIX_RE = re.compile(r"(^|[;&|(]\s*)sudo\s+(?=[^-\s])")
+
+    @staticmethod
+    def _stream(pipe, style: str, sink: list):
+        for line in iter(pipe.readline, ''):
+            sink.append(line)
+            console.print(line.rstrip("\n"), style=style, markup=False, highlight=False)
+        pipe.close()
+
     @staticmethod
-    def apply_fix(command: str, description: str, requires_sudo: bool = False) -> bool:
+    def _authorize_sudo() -> bool:
+        """
+        Lets sudo ask for the password in the foreground (it needs the
+        terminal) and caches the credentials for the streamed command.
+        Not needed (and always True) when running as root.
+        """
+        if os.geteuid() == 0:
+            return True
+        if not shutil.which("sudo"):
+            console.print("[bold red]sudo is not installed;[/bold red] run Logix as root to apply privileged fixes.")
+            return False
+        try:
+            return subprocess.run(["sudo", "-v"]).returncode == 0
+        except (OSError, KeyboardInterrupt):
+            return False
+
+    @staticmethod
+    def _terminate(process):
+        # The command runs in its own process group, so this also reaches
+        # children (e.g. the dpkg spawned by apt).
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+            process.wait(Fixer.KILL_GRACE)
+        except subprocess.TimeoutExpired:
+            os.killpg(process.pid, signal.SIGKILL)
+            process.wait()
+        except ProcessLookupError:
+            pass
+
+    @staticmethod
+    def run_command(command: str, timeout: int = DEFAULT_TIMEOUT, requires_sudo: bool = False) -> dict:
+        """
+        Runs a shell command, streaming stdout/stderr to the console as it is
+        produced. The command is killed after `timeout` seconds or on Ctrl+C.
+        Commands using sudo get its password prompt in the foreground first.
+        Returns status ('success', 'failed', 'timeout' or 'cancelled'),
+        returncode, duration and the captured output.
+        """
+        start = time.monotonic()
+        stdout, stderr = [], []
+        if (requires_sudo or re.search(r"\bsudo\b", command)) and not Fixer._authorize_sudo():
+            return {"status": "failed", "returncode": None, "duration": time.monotonic() - start,
+                    "stdout": "", "stderr": "sudo authentication failed" if shutil.which("sudo") else "sudo is not installed"}
+        if os.geteuid() == 0 and not shutil.which("sudo"):
+            # Root in a container without sudo: plain 'sudo <command>' prefixes are no-ops
+            command = Fixer._SUDO_PREFIX_RE.sub(r"\1", command)
+
+        # Use shell=True for complex commands (pipes etc), but be careful.
+        # The command stays in the terminal's session (sudo's cached
+        # credentials are tied to it) but gets its own process group, so a
+        # timeout or Ctrl+C can stop all of its children.
+        process = subprocess.Popen(
+            command, shell=True, text=True, bufsize=1,
+            stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            preexec_fn=lambda: os.setpgid(0, 0),
+        )
+        readers = [
+            threading.Thread(target=Fixer._stream, args=(process.stdout, "dim", stdout), daemon=True),
+            threading.Thread(target=Fixer._stream, args=(process.stderr, "red", stderr), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+
+        try:
+            process.wait(timeout)
+            status = "success" if process.returncode == 0 else "failed"
+        except subprocess.TimeoutExpired:
+            Fixer._terminate(process)
+            status = "timeout"
+        except KeyboardInterrupt:
+            Fixer._terminate(process)
+            status = "cancelled"
+
+        for reader in readers:
+            reader.join(1)
+
+        return {
+            "status": status,
+            "returncode": process.returncode,
+            "duration": time.monotonic() - start,
+            "stdout": "".join(stdout),
+            "stderr": "".join(stderr),
+        }
+
+    @staticmethod
+    def apply_fix(command: str, description: str, requires_sudo: bool = False,
+                  fingerprint: str = None, outcomes: FixOutcomes = None, timeout: int = DEFAULT_TIMEOUT) -> bool:
         """
         Prompts user and executes a command.
+        If `outcomes` and `fingerprint` are given, the result is recorded.
         """
         console.print(f"\n[bold yellow]Suggested Fix:[/bold yellow] {description}")
         console.print(f"[bold cyan]Command:[/bold cyan] {command}")
-        
+
         if requires_sudo:
             console.print("[bold red]Note:[/bold red] This command requires sudo privileges.")
 
         if Confirm.ask("Do you want to execute this command?"):
             try:
-                # If sudo is required, we might just rely on the command string containing 'sudo' 
-                # or prepend it if the agent flag it. 
+                # If sudo is required, we might just rely on the command string containing 'sudo'
+                # or prepend it if the agent flag it.
                 # Note: The agent might put 'sudo apt update' in the command string itself.
-                # Use shell=True for complex commands (pipes etc), but be careful.
-                console.print("[dim]Executing...[/dim]")
-                
-                result = subprocess.run(command, shell=True, capture_output=True, text=True)
-                
-                if result.returncode == 0:
-                    console.print("[bold green]Success![/bold green]")
-                    console.print(result.stdout)
+                console.print(f"[dim]Executing (timeout {timeout}s, Ctrl+C to cancel)...[/dim]")
+
+                result = Fixer.run_command(command, timeout, requires_sudo)
+                if outcomes is not None and fingerprint:
+                    outcomes.record(fingerprint, command, description, result)
+
+                if result["status"] == "success":
+                    console.print(f"[bold green]Success![/bold green] [dim]({result['duration']:.1f}s)[/dim]")
                     return True
+                elif result["status"] == "timeout":
+                    console.print(f"[bold red]Command timed out after {timeout}s and was stopped.[/bold red]")
+                elif result["status"] == "cancelled":
+                    console.print("[bold yellow]Command cancelled.[/bold yellow]")
                 else:
-                    console.print("[bold red]Command Failed:[/bold red]")
-                    console.print(result.stderr)
-                    return False
+                    console.print(f"[bold red]Command Failed[/bold red] (exit code {result['returncode']})")
+                return False
             except Exception as e:
                 console.print(f"[bold red]Execution Error:[/bold red] {e}")
                 return False
@@ -8,6 +8,7 @@ class HistoryManager:
         self.history_file = history_file
         self.ensure_data_dir()
         self.history = self.load()
+        self._build_index()
 
     def ensure_data_dir(self):
         directory = os.path.dirname(self.history_file)
@@ -23,6 +24,15 @@ class HistoryManager:
         except json.JSONDecodeError:
             return {"history": []}
 
+    def _build_index(self):
+        # Latest timestamp per finding hash, so duplicate checks are O(1)
+        # instead of a scan over the whole history.
+        self._index = {}
+        for entry in self.history.get("history", []):
+            entry_time = datetime.fromisoformat(entry["timestamp"])
+            if entry["id"] not in self._index or entry_time > self._index[entry["id"]]:
+                self._index[entry["id"]] = entry_time
+
     def save(self):
         with open(self.history_file, 'w') as f:
             json.dump(self.history, f, indent=2)
@@ -37,22 +47,20 @@ class HistoryManager:
         finding_hash = self._get_hash(finding_text)
         cutoff = datetime.now() - timedelta(hours=hours)
 
-        for entry in self.history.get("history", []):
-            if entry["id"] == finding_hash:
-                entry_time = datetime.fromisoformat(entry["timestamp"])
-                if entry_time > cutoff:
-                    return True
-        return False
+        entry_time = self._index.get(finding_hash)
+        return entry_time is not None and entry_time > cutoff
 
     def add_entry(self, finding_text, severity, summary):
         finding_hash = self._get_hash(finding_text)
+        now = datetime.now()
         entry = {
             "id": finding_hash,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "severity": severity,
             "summary": summary
         }
         self.history.setdefault("history", []).append(entry)
+        self._index[finding_hash] = now
         self.save()
 
     def prune(self, days=30):
@@ -62,4 +70,5 @@ class HistoryManager:
             if datetime.fromisoformat(entry["timestamp"]) > cutoff
         ]
         self.history["history"] = new_history
+        self._build_index()
         self.save()
@@ -1,17 +1,21 @@
 import argparse
 import sys
+import time
+from typing import TYPE_CHECKING
 from rich.console import Console
 from rich.panel import Panel
-from rich.markdown import Markdown
-from rich.prompt import Prompt, Confirm
 from src.config import Config
-from src.collector import LogCollector
-from src.analyzer import LogAnalyzer
-from src.fixer import Fixer
-from src.history import HistoryManager
-from src.notifier import Notifier
 from src.filter import LogFilter
-from src.monitor import SystemMonitor
+from src.output import emit_record, records_only
+from src.profiler import profiler
+
+# Everything else (openai, psutil, requests, rich.prompt, ...) is imported
+# inside the mode that needs it, so short invocations start quickly.
+if TYPE_CHECKING:
+    from src.analyzer import LogAnalyzer
+    from src.fixer import FixOutcomes
+    from src.history import HistoryManager
+    from src.notifier import AlertDigest
 
 console = Console()
 
@@ -45,67 +49,297 @@ def parse_duration(duration_str) -> int:
         raise ValueError(f"Invalid duration format: {duration_str}")
 
 
-def process_log_source(source_name: str, source_path: str, args, log_filter: LogFilter):
+def parse_time_bound(value: str, now: float = None) -> float:
+    """
+    Converts a --since/--until value to a unix epoch: a duration ago
+    ('30m', '2h'), a time of day ('02:00', most recent past occurrence) or
+    a date/datetime ('2024-05-01', '2024-05-01 02:15').
+    """
+    from datetime import datetime, timedelta
+
+    now = time.time() if now is None else now
+    try:
+        return now - parse_duration(value)
+    except (ValueError, IndexError):
+        pass
+
+    value = value.strip()
+    for fmt in ("%H:%M", "%H:%M:%S"):
+        try:
+            parsed = datetime.strptime(value, fmt).time()
+        except ValueError:
+            continue
+        moment = datetime.combine(datetime.fromtimestamp(now).date(), parsed)
+        if moment.timestamp() > now:
+            moment -= timedelta(days=1)
+        return moment.timestamp()
+
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise ValueError(f"Invalid time format: {value} (use e.g. 2h, 02:00 or 2024-05-01 02:00)")
+
+
+def time_window(args):
+    """(since, until) epochs from --since/--until, resolved now so relative values stay current in the daemon."""
+    now = time.time()
+    since = parse_time_bound(args.since, now) if args.since else None
+    until = parse_time_bound(args.until, now) if args.until else None
+    if since is not None and until is not None and until <= since and ":" in args.until and "-" not in args.until:
+        # '23:50' to '00:10' spans midnight
+        until += 86400
+    return since, until
+
+
+def _create_digest() -> "AlertDigest":
+    from src.notifier import NotificationDispatcher, AlertDigest
+    from src.outbox import NotificationOutbox
+
+    outbox = NotificationOutbox(Config.OUTBOX_FILE)
+    outbox.prune()
+    dispatcher = NotificationDispatcher(outbox, immediate=Config.DIGEST_IMMEDIATE)
+    return AlertDigest(dispatcher, Config.DIGEST_WINDOW)
+
+
+def offer_known_fixes(logs: str, outcomes: "FixOutcomes", timeout: int) -> str:
+    """
+    Offers previously successful fixes for log lines whose fingerprint has one.
+    Lines logged before that fix was applied are old occurrences it already
+    dealt with: they are dropped without offering it again. Returns the logs
+    without those lines and the lines whose fix was applied again.
+    """
+    from datetime import datetime
+    from src.correlator import parse_timestamp
+    from src.fixer import Fixer, FixOutcomes
+
+    lines = logs.splitlines()
+    fingerprints = [FixOutcomes.fingerprint(line) for line in lines]
+    known_fixes = {fingerprint: outcomes.known_fix(fingerprint) for fingerprint in set(fingerprints)}
+    fixed_at = {fingerprint: datetime.fromisoformat(known["timestamp"]).timestamp()
+                for fingerprint, known in known_fixes.items() if known}
+
+    now = datetime.now()
+    current = []
+    for line, fingerprint in zip(lines, fingerprints):
+        ts = parse_timestamp(line, now) if fingerprint in fixed_at else None
+        # Lines without a timestamp cannot be placed before the fix and stay
+        if ts is None or ts >= fixed_at[fingerprint]:
+            current.append((line, fingerprint))
+    if len(current) < len(lines):
+        console.print(f"[dim]Skipped {len(lines) - len(current)} line(s) logged before their known fix was applied.[/dim]")
+
+    offered = set()
+    fixed = set()
+    for line, fingerprint in current:
+        if fingerprint in offered:
+            continue
+        offered.add(fingerprint)
+
+        known = known_fixes[fingerprint]
+        if not known:
+            continue
+        console.print(f"\n[bold]Known issue[/bold] [dim](fixed {known['successes']} time(s) before):[/dim] {line}")
+        if Fixer.apply_fix(known["command"], known["description"], fingerprint=fingerprint, outcomes=outcomes, timeout=timeout):
+            fixed.add(fingerprint)
+
+    if not fixed and len(current) == len(lines):
+        return logs
+    return "\n".join(line for line, fingerprint in current if fingerprint not in fixed)
+
+
+def _report(args, source_name: str, source_path: str, status: str, **fields):
+    # One summary record per source in --format jsonl
+    if args.format == "jsonl":
+        emit_record("source", source=source_name, path=source_path, status=status, **fields)
+
+
+def scan_file(source_name: str, source_path: str, args, keywords, exclude, since=None, until=None) -> str:
+    """
+    Scans the whole file (or the --since/--until window of it) on all cores
+    and returns one representative line per message template, the most
+    frequent first, instead of the last N lines.
+    """
+    import os
+    from src.collector import CollectorError, LogCollector
+    from src.scanner import LogScanner
+
+    if not os.path.isfile(source_path):
+        return CollectorError(f"Error: {source_path} is not a file.")
+    try:
+        start, end = LogCollector.time_range(source_path, since, until) \
+            if since is not None or until is not None else (0, None)
+        with profiler.span("scan", path=source_path) as span:
+            result = LogScanner(args.workers).scan(source_path, keywords, exclude, start, end)
+            span.output(lines_in=result["lines"], bytes_in=result["bytes"])
+        logs = LogScanner.representative_lines(result, args.lines)
+    except ValueError as e:
+        return CollectorError(f"Error: {e}.")
+    except OSError as e:
+        return CollectorError(f"Error reading file {source_path}: {e}")
+
+    top = [{"template": t["template"], "count": t["count"]} for t in result["templates"][:args.lines]]
+    if args.format == "jsonl":
+        emit_record("scan", source=source_name, path=source_path, lines=result["lines"], bytes=result["bytes"],
+                    matched=result["matched"], ignored=result["ignored"], templates=len(result["templates"]), top=top)
+    if not args.headless:
+        console.print(f"[dim]Scanned {result['lines']:,} lines ({result['bytes'] / (1024 * 1024):.1f} MiB): "
+                      f"{result['matched']:,} matching in {len(result['templates']):,} distinct messages, "
+                      f"{result['ignored']:,} ignored.[/dim]")
+    return logs
+
+
+def process_log_source(source_name: str, source_path: str, args, log_filter: LogFilter, digest: "AlertDigest" = None,
+                       analyzer: "LogAnalyzer" = None, history: "HistoryManager" = None):
     """
     Runs the full analysis pipeline for a single source.
+    In cron mode, new findings are added to `digest` (created and flushed
+    locally if not given) and delivered in the background. Long-running
+    callers pass `analyzer` and `history` to keep them warm across runs.
     """
-    if not args.cron:
-        console.rule(f"[bold cyan]Checking Source: {source_name}[/bold cyan]")
-        console.print(f"Path/Command: [dim]{source_path}[/dim]")
-
-    # 1. Collect Logs
-    with console.status(f"[bold green]Collecting logs from {source_name}..."):
-        if source_path == "journalctl":
-            logs = LogCollector.get_journal_logs(args.lines)
-        else:
-            logs = LogCollector.get_file_logs(source_path, args.lines)
+    from src.collector import CollectorError
+    from src.sources import SourceRegistry
+
+    with profiler.span("source", category="source", profile=False, source=source_name):
+        if not args.headless:
+            console.rule(f"[bold cyan]Checking Source: {source_name}[/bold cyan]")
+            console.print(f"Path/Command: [dim]{source_path}[/dim]")
+
+        # 1. Collect Logs (only lines with trigger keywords, unless --no-pushdown)
+        keywords = None if args.no_pushdown else LogFilter.TRIGGER_KEYWORDS
+        since, until = time_window(args)
+        with console.status(f"[bold green]Collecting logs from {source_name}..."), profiler.span("collect") as span:
+            source = SourceRegistry.resolve(source_path)
+            if args.scan and source.kind == "file":
+                logs = scan_file(source_name, source_path, args, keywords, log_filter.get_patterns(), since, until)
+            else:
+                if args.scan and not args.headless:
+                    console.print(f"[dim]--scan only applies to plain files; collecting the last {args.lines} lines.[/dim]")
+                logs = source.collect(args.lines, keywords, log_filter.get_patterns(), since, until,
+                                      priority=args.priority, units=args.unit)
+            span.output(logs)
+
+        if isinstance(logs, CollectorError):
+            console.print(f"[bold red]{logs}[/bold red]")
+            _report(args, source_name, source_path, "error", error=logs.strip())
+            return # Skip to next source
 
-    if not logs or "Error" in logs[:20]: # specific error checks from collector
-        if "Error" in logs[:50]:
-             console.print(f"[bold red]{logs}[/bold red]")
-             return # Skip to next source
         if not logs.strip():
-             if not args.cron:
-                console.print(f"[bold yellow]No logs found in {source_name}.[/bold yellow]")
-             return # Skip to next source
-    
-    if not args.cron:
+            # With keywords pushed down, nothing collected means no keyword matched
+            if not args.headless:
+                if keywords:
+                    console.print(f"[bold green]No relevant error keywords found in {source_name}. Skipping analysis.[/bold green]")
+                else:
+                    console.print(f"[bold yellow]No logs found in {source_name}.[/bold yellow]")
+            _report(args, source_name, source_path, "no_keywords" if keywords else "empty", lines_collected=0)
+            return # Skip to next source
+
+        process_logs(source_name, source_path, logs, args, log_filter, digest=digest, analyzer=analyzer, history=history)
+
+
+def create_syslog_listener(source_name: str, source_path: str, args, log_filter: LogFilter, lock=None, **pipeline):
+    """
+    Builds a SyslogReceiver for a 'syslog://' / 'syslog+tcp://' source whose
+    batches go through process_logs. `pipeline` holds the digest/analyzer/
+    history passed on to it; `lock` serializes batches with other checks
+    sharing them.
+    """
+    from contextlib import nullcontext
+    from src.syslog_server import SyslogReceiver, format_record, parse_address
+
+    digest = pipeline.get("digest")
+
+    def on_batch(records):
+        # Keep the --lines budget for lines that can matter: keyword lines that
+        # are not ignored (filtering only after the cut could drop real errors)
+        lines = [line for line in map(format_record, records)
+                 if log_filter.contains_keywords(line) and not log_filter.should_ignore(line)]
+        if not lines:
+            return
+        with lock or nullcontext():
+            process_logs(source_name, source_path, "\n".join(lines[-args.lines:]), args, log_filter, **pipeline)
+            # Without a digest window, deliver after every batch (a listener has no end of run)
+            if digest and (not digest.window or digest.due()):
+                digest.flush()
+
+    protocol, host, port = parse_address(source_path)
+    return SyslogReceiver(host, port, protocol, on_batch)
+
+
+def process_logs(source_name: str, source_path: str, logs: str, args, log_filter: LogFilter, digest: "AlertDigest" = None,
+                 analyzer: "LogAnalyzer" = None, history: "HistoryManager" = None):
+    """
+    Filters, analyzes and reports on already collected logs
+    (see process_log_source for the parameters).
+    """
+    from rich.prompt import Prompt, Confirm
+    from src.analyzer import LogAnalyzer
+    from src.fixer import Fixer, FixOutcomes
+    from src.history import HistoryManager
+
+    def report(status: str, **fields):
+        _report(args, source_name, source_path, status, **fields)
+
+    if not args.headless:
         console.print(f"[dim]Collected {len(logs.splitlines())} lines.[/dim]")
 
     # 2. Filter logs
     original_line_count = len(logs.splitlines())
-    logs = log_filter.filter_logs(logs)
+    with profiler.span("filter", data=logs) as span:
+        logs = log_filter.filter_logs(logs)
+        span.output(logs)
     filtered_line_count = len(logs.splitlines())
     
-    if original_line_count > filtered_line_count and not args.cron:
+    if original_line_count > filtered_line_count and not args.headless:
         console.print(f"[dim]Filtered {original_line_count - filtered_line_count} ignored lines.[/dim]")
 
+    counts = {"lines_collected": original_line_count, "lines_after_filter": filtered_line_count}
+
     if not logs.strip():
-        if not args.cron:
+        if not args.headless:
             console.print(f"[bold green]All logs in {source_name} filtered or empty. No issues.[/bold green]")
+        report("filtered", **counts)
         return
 
     # 3. Keyword check
-    if not log_filter.contains_keywords(logs):
-        if not args.cron:
+    with profiler.span("keywords", data=logs):
+        relevant = log_filter.contains_keywords(logs)
+    if not relevant:
+        if not args.headless:
             console.print(f"[bold green]No relevant error keywords found in {source_name}. Skipping analysis.[/bold green]")
+        report("no_keywords", **counts)
         return
 
-    # 4. Analyze Logs
-    with console.status(f"[bold green]Analyzing {source_name} with AI..."):
-        analyzer = LogAnalyzer(Config.OPENROUTER_API_KEY, Config.OPENROUTER_BASE_URL)
+    # 4. Offer fixes that already worked for these exact messages
+    outcomes = FixOutcomes()
+    if not args.headless:
+        logs = offer_known_fixes(logs, outcomes, args.fix_timeout)
+        if not log_filter.contains_keywords(logs):
+            console.print(f"[bold green]Remaining logs in {source_name} have no error keywords. Skipping analysis.[/bold green]")
+            return
+
+    # 5. Analyze Logs
+    with console.status(f"[bold green]Analyzing {source_name} with AI..."), profiler.span("analyze", data=logs) as span:
+        if analyzer is None:
+            analyzer = LogAnalyzer(Config.OPENROUTER_API_KEY, Config.OPENROUTER_BASE_URL)
         analysis = analyzer.analyze(logs, args.model)
+        span.output(findings=len(analysis.get("findings", [])))
 
-    # 5. Process Results
+    # 6. Process Results
     has_issues = analysis.get("has_issues")
     findings = analysis.get("findings", [])
+    report("issues" if has_issues else "clean", summary=analysis.get("summary"), findings=len(findings), **counts)
 
     if args.cron:
         if not has_issues:
             return
             
-        history = HistoryManager()
-        notifier = Notifier()
+        if history is None:
+            with profiler.span("history"):
+                history = HistoryManager()
+        owns_digest = digest is None
+        if owns_digest:
+            with profiler.span("notify"):
+                digest = _create_digest()
         
         for finding in findings:
             log_entry = finding.get('log_entry', '')
@@ -113,12 +347,31 @@ def process_log_source(source_name: str, source_path: str, args, log_filter: Log
             summary = finding.get('findings', 'Issue detected')
             finding_text = finding.get('explanation', summary)
 
-            if not history.is_duplicate(log_entry):
+            with profiler.span("history"):
+                duplicate = history.is_duplicate(log_entry)
+            if args.format == "jsonl":
+                emit_record("finding", source=source_name, duplicate=duplicate, **finding)
+
+            if not duplicate:
                 console.print(f"New finding detected in {source_name}: {severity}")
-                notifier.notify_all(finding)
-                history.add_entry(log_entry, severity, finding_text)
+                # Queued durably before it is recorded as seen, so a delivery
+                # outage cannot turn it into a silently skipped duplicate
+                with profiler.span("notify"):
+                    digest.add(finding, source_name)
+                with profiler.span("history"):
+                    history.add_entry(log_entry, severity, finding_text)
             else:
                 console.print(f"Duplicate finding skipped: {log_entry[:50]}...")
+
+        if owns_digest:
+            with profiler.span("notify"):
+                digest.flush()
+                digest.dispatcher.close()
+        return
+
+    if args.format == "jsonl":
+        for finding in findings:
+            emit_record("finding", source=source_name, **finding)
         return
 
     # Interactive Mode
@@ -139,7 +392,8 @@ def process_log_source(source_name: str, source_path: str, args, log_filter: Log
         
         fix_applied = False
         if fix and fix.get("command"):
-            if Fixer.apply_fix(fix["command"], fix["description"], fix.get("requires_sudo", False)):
+            if Fixer.apply_fix(fix["command"], fix.get("description", ""), fix.get("requires_sudo", False),
+                               fingerprint=FixOutcomes.fingerprint(log_entry), outcomes=outcomes, timeout=args.fix_timeout):
                 fix_applied = True
         elif fix:
             console.print(f"[bold blue]Suggestion:[/bold blue] {fix.get('description')}")
@@ -157,23 +411,111 @@ def process_log_source(source_name: str, source_path: str, args, log_filter: Log
          Prompt.ask("Press Enter to continue to next log source...")
 
 
+def print_config_findings(findings: list):
+    if not findings:
+        console.print("[bold green]No issues found. Configuration looks good.[/bold green]")
+        return
+    for i, finding in enumerate(findings, 1):
+        severity = finding.get('severity', 'info')
+        color = "red" if severity in ['critical', 'high'] else "yellow"
+
+        console.print(f"\n[{color}][bold]{i}. {finding.get('issue')} ({severity.upper()})[/bold][/{color}]")
+        if finding.get('line_number'):
+            console.print(f"   [dim]Line: {finding.get('line_number')}[/dim]")
+        if finding.get('parameter'):
+            console.print(f"   [dim]Parameter: {finding.get('parameter')}[/dim]")
+
+        console.print(f"   [bold]Suggestion:[/bold] {finding.get('suggestion')}")
+        if finding.get('suggested_value'):
+            console.print(f"   [bold blue]Recommended Value:[/bold blue] {finding.get('suggested_value')}")
+
+
+def print_config_overview(results: list):
+    """One row per audited file, for multi-file --config runs."""
+    from rich.table import Table
+
+    table = Table(title="Config Audit Summary")
+    table.add_column("File", overflow="fold")
+    table.add_column("Status")
+    table.add_column("Findings", justify="right")
+    table.add_column("Worst")
+    for result in results:
+        severities = [f.get("severity", "info") for f in result["findings"]]
+        worst = next((s for s in ("critical", "high", "warning", "info") if s in severities), "-")
+        if result["status"] == "error":
+            status = "[red]error[/red]"
+        elif result["has_issues"]:
+            status = "[yellow]issues[/yellow]"
+        elif result["status"] == "audited":
+            status = "[green]ok[/green]"
+        else:
+            status = f"[dim]{result['status']}[/dim]"
+        table.add_row(result["path"], status, str(len(result["findings"])), worst)
+    console.print(table)
+
+    counts = {}
+    for result in results:
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+    flagged = sum(1 for r in results if r["has_issues"])
+    console.print(f"[bold]{flagged} file(s) with issues[/bold] [dim]("
+                  + ", ".join(f"{n} {status}" for status, n in sorted(counts.items())) + ")[/dim]")
+
 
 def main():
     parser = argparse.ArgumentParser(description="AI Agent for PC Log Analysis and Repair")
-    parser.add_argument("--model", type=str, help="OpenRouter model to use", default=Config.DEFAULT_MODEL)
+    parser.add_argument("--model", type=str, help="OpenRouter model to use (default: DEFAULT_MODEL from .env)")
     parser.add_argument("--lines", type=int, default=50, help="Number of log lines to analyze")
-    parser.add_argument("--source", type=str, default="journalctl", help="Log source: 'journalctl', /path/to/file, 'menu', or 'all'")
+    parser.add_argument("--source", type=str, default="journalctl", help="Log source: 'journalctl', /path/to/file, a glob of rotated files, 'cmd:<command>', 'docker:<container>', 'menu', or 'all'")
     parser.add_argument("--cron", action="store_true", help="Run in cron/headless mode")
-    parser.add_argument("--config", type=str, help="Path to a configuration file to analyze")
+    parser.add_argument("--priority", choices=["emerg", "alert", "crit", "err", "warning", "notice", "info", "debug"],
+                        help="Journal only: collect entries of this priority or more severe (journalctl -p)")
+    parser.add_argument("--unit", action="append", help="Journal only: collect entries of this systemd unit (repeatable)")
+    parser.add_argument("--reprobe", action="store_true", help="With --source all: re-check which sources exist on this host instead of using the cached result")
+    parser.add_argument("--scan", action="store_true", help="File sources: scan the whole file on all cores and analyze one line per distinct message instead of the last N lines")
+    parser.add_argument("--workers", type=int, help="Processes used by --scan (default: number of CPUs)")
+    parser.add_argument("--no-pushdown", action="store_true", help="Collect the last N lines as-is instead of only lines with error keywords")
+    parser.add_argument("--daemon", action="store_true", help="Stay resident and check each source on its own schedule (headless)")
+    parser.add_argument("--config", type=str, nargs="+", help="Configuration file(s), directories or glob patterns to analyze")
+    parser.add_argument("--jobs", type=int, default=4, help="Config files audited in parallel (default: 4)")
+    parser.add_argument("--force", action="store_true", help="With --config: re-audit files that are unchanged since their last clean audit")
     parser.add_argument("--generate", type=str, help="Path to save a generated configuration file (requires --prompt)")
     parser.add_argument("--prompt", type=str, help="Custom instruction for analysis or generation")
     parser.add_argument("--show-ignored", action="store_true", help="Show list of ignored patterns")
     parser.add_argument("--monitor", action="store_true", help="Run in System Monitor mode")
     parser.add_argument("--duration", type=str, default="60", help="Monitoring duration (e.g. 60s, 5m, 1h)")
     parser.add_argument("--interval", type=int, default=5, help="Monitoring snapshot interval in seconds (default: 5)")
+    parser.add_argument("--fix-timeout", type=int, help="Seconds before a running fix command is stopped (default: LOGIX_FIX_TIMEOUT or 300)")
+    parser.add_argument("--format", choices=["text", "jsonl"], default="text", help="Output format; 'jsonl' streams one JSON record per source/finding/summary to stdout, without prompts")
+    parser.add_argument("--record", action="store_true", help="Continuously record metrics into the on-disk ring file (for --monitor --since)")
+    parser.add_argument("--since", type=str, help="Only analyze entries logged since: a duration ago (30m, 2h), a time (02:00) or a date/time (2024-05-01 02:00). With --monitor: replay recorded metrics instead of sampling")
+    parser.add_argument("--until", type=str, help="Only analyze entries logged up to this time (same formats as --since)")
+    parser.add_argument("--profile", action="store_true", help="Time each pipeline stage; print a summary and write a Chrome trace on exit")
+    parser.add_argument("--trace-file", type=str, default="data/trace.json", help="Trace file written by --profile (default: data/trace.json)")
+    parser.add_argument("--cprofile", action="store_true", help="With --profile: also run stages under cProfile and dump the hottest one next to the trace file")
     
     args = parser.parse_args()
 
+    if args.format == "jsonl":
+        # jsonl runs never prompt, so modes that only work interactively are rejected
+        if args.source == "menu":
+            parser.error("--source menu is interactive; use --source all or a path with --format jsonl")
+        if args.generate:
+            parser.error("--generate asks before saving and does not support --format jsonl")
+        # stdout carries only records; every console and print goes to stderr
+        records_only()
+
+    if args.scan and args.source not in ("menu", "all"):
+        from src.sources import SourceRegistry
+        from src.syslog_server import is_syslog_source
+        if is_syslog_source(args.source) or SourceRegistry.resolve(args.source).kind != "file":
+            parser.error("--scan only applies to plain files, not the journal, commands, containers, globs or listeners")
+
+    if args.profile:
+        import atexit
+        profiler.enable(args.trace_file, cprofile=args.cprofile)
+        # Modes finish with sys.exit, so the report is printed at interpreter exit
+        atexit.register(profiler.report, console)
+
     # Initialize Filter
     log_filter = LogFilter()
 
@@ -186,6 +528,38 @@ def main():
             console.print("[dim]No ignored patterns found.[/dim]")
         sys.exit(0)
 
+    # Fail early on malformed time bounds (they are resolved again at each collection)
+    try:
+        time_window(args)
+    except ValueError as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        sys.exit(1)
+
+    # Defaults that come from .env are resolved only now, so --show-ignored skips config discovery
+    # (a daemon SIGHUP re-resolves the model only if it came from .env)
+    args.model_from_config = not args.model
+    args.model = args.model or Config.DEFAULT_MODEL
+    if args.fix_timeout is None:
+        args.fix_timeout = Config.FIX_TIMEOUT
+
+    # Handle --record (no API key needed, runs until killed)
+    if args.record:
+        from src.monitor import SystemMonitor
+        from src.recorder import MetricsRecorder
+
+        try:
+            recorder = MetricsRecorder(SystemMonitor(), Config.METRICS_FILE, Config.METRICS_CAPACITY)
+        except ValueError as e:
+            console.print(f"[bold red]Error:[/bold red] {e} (LOGIX_METRICS_CAPACITY)")
+            sys.exit(1)
+
+        console.print(f"[bold green]Recording metrics every {args.interval}s to {Config.METRICS_FILE}[/bold green] [dim](Ctrl+C to stop)[/dim]")
+        try:
+            recorder.run(interval=args.interval)
+        except KeyboardInterrupt:
+            console.print("\n[yellow]Recorder stopped.[/yellow]")
+        sys.exit(0)
+
     # 1. Validate Config
     try:
         Config.validate()
@@ -194,11 +568,25 @@ def main():
         console.print("Please copy [bold].env.example[/bold] to [bold].env[/bold] and set your API key.")
         sys.exit(1)
 
-    if not args.cron:
+    # The daemon is headless like cron, just without the per-run process
+    if args.daemon:
+        args.cron = True
+    # Headless runs never prompt and keep progress chatter out of the way
+    args.headless = args.cron or args.format == "jsonl"
+
+    if not args.headless:
         console.print(f"[bold green]Starting Logix[/bold green]")
         console.print(f"Model: [cyan]{args.model}[/cyan]")
     
     if args.monitor:
+        import os
+        from src.collector import CollectorError, LogCollector
+        from src.analyzer import LogAnalyzer
+        from src.monitor import SystemMonitor
+        from src.anomaly import AnomalyDetector
+        from src.recorder import MetricsRing
+        from src.correlator import LogCorrelator
+
         monitor = SystemMonitor()
         
         try:
@@ -208,7 +596,7 @@ def main():
             sys.exit(1)
 
         # 1. Gather Specs
-        with console.status("[bold green]Gathering system specifications..."):
+        with console.status("[bold green]Gathering system specifications..."), profiler.span("specs"):
             specs = monitor.get_system_specs()
         
         console.print(Panel(
@@ -220,33 +608,108 @@ def main():
             border_style="cyan"
         ))
 
-        # 2. Monitor Loop
-        console.print(f"[bold]Monitoring system for {duration_sec} seconds...[/bold]")
-        with console.status("[bold green]Tracking performance metrics... (Press Ctrl+C to stop early)"):
-            try:
-                metrics = monitor.monitor_performance(duration=duration_sec, interval=args.interval)
-            except KeyboardInterrupt:
-                console.print("\n[yellow]Monitoring interrupted. Analyzing collected data...[/yellow]")
-                metrics = {"error": "Interrupted by user"} # Or implement graceful partial return
+        # 2. Monitor Loop (or replay recorded history)
+        if args.since:
+            since, until = time_window(args)
+            with profiler.span("replay") as span:
+                samples = MetricsRing.read(Config.METRICS_FILE, since=since, until=until)
+                span.output(samples=len(samples))
+            if not samples:
+                console.print(f"[bold red]Monitoring Failed:[/bold red] No recorded metrics since {args.since} at {Config.METRICS_FILE}. Start the recorder with [bold]logix --record[/bold].")
+                sys.exit(1)
+
+            console.print(f"[bold]Analyzing recorded metrics from {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(since))}"
+                          f"{' to ' + args.until if args.until else ''}...[/bold]")
+            detector = AnomalyDetector()
+            with profiler.span("detect", samples=len(samples)):
+                for sample in samples:
+                    detector.observe(sample)
+            duration = int(samples[-1]["epoch"] - samples[0]["epoch"])
+            step = int(duration / (len(samples) - 1)) if len(samples) > 1 else args.interval
+            metrics = SystemMonitor.summarize(samples, duration, step, detector)
+        else:
+            console.print(f"[bold]Monitoring system for {duration_sec} seconds...[/bold]")
+            with console.status("[bold green]Tracking performance metrics... (Press Ctrl+C to stop early)"), profiler.span("sample"):
+                try:
+                    metrics = monitor.monitor_performance(duration=duration_sec, interval=args.interval)
+                except KeyboardInterrupt:
+                    console.print("\n[yellow]Monitoring interrupted. Analyzing collected data...[/yellow]")
+                    metrics = {"error": "Interrupted by user"} # Or implement graceful partial return
 
         if "error" in metrics and metrics["error"] != "Interrupted by user":
              console.print(f"[bold red]Monitoring Failed:[/bold red] {metrics['error']}")
              sys.exit(1)
 
-        console.print(f"[dim]Collected {len(metrics.get('samples', []))} data points.[/dim]")
+        anomalies = metrics.get("anomalies", [])
+        console.print(f"[dim]Collected {len(metrics.get('samples', []))} data points, {len(anomalies)} anomalous window(s).[/dim]")
+
+        if not anomalies and "error" not in metrics:
+            summary = metrics.get("summary", {})
+            console.print(Panel(
+                f"[bold]Healthy[/bold]\n\nNo anomalous windows detected locally. "
+                f"Avg CPU {summary.get('avg_cpu_usage')}, max CPU {summary.get('max_cpu_usage')}, avg memory {summary.get('avg_mem_usage')}.",
+                title="Health Diagnosis",
+                border_style="green"
+            ))
+            if args.format == "jsonl":
+                emit_record("monitor_summary", overall_status="Healthy", specs=specs,
+                            summary=summary, samples=len(metrics.get("samples", [])), anomalies=0, findings=[])
+            sys.exit(0)
+
+        # Only anomalous windows (with their surrounding context) go to the LLM
+        metrics = {key: value for key, value in metrics.items() if key != "samples"}
 
         # 3. Collect Recent Logs (Context)
+        correlator = LogCorrelator(LogFilter.TRIGGER_KEYWORDS)
+        correlations = None
         with console.status("[bold green]Fetching recent system logs for context..."):
-            logs = LogCollector.get_journal_logs(lines=50) # Default to journal for context
+            spike_epochs = [
+                sample["epoch"]
+                for window in anomalies
+                for sample in window.get("samples", [])
+                if "epoch" in sample
+            ]
+            # A plain file given with --source is used for context instead of the journal
+            context_file = args.source if args.source not in ("journalctl", "menu", "all") and os.path.isfile(args.source) else None
+            with profiler.span("collect") as span:
+                if spike_epochs:
+                    # Pull everything logged around the spikes (the correlator condenses it),
+                    # bounded on both sides: the line cap keeps the newest entries, which
+                    # would push out the early spikes on a long replay
+                    start, end = min(spike_epochs) - correlator.margin, max(spike_epochs) + correlator.margin
+                    if context_file:
+                        logs = LogCollector.get_file_logs(context_file, lines=2000, since=start, until=end)
+                    else:
+                        logs = LogCollector.get_journal_logs(lines=2000, since=start, until=end, output="short-iso")
+                elif context_file:
+                    logs = LogCollector.get_file_logs(context_file, lines=50)
+                else:
+                    logs = LogCollector.get_journal_logs(lines=50) # Default to journal for context
+                span.output(logs)
+            collected = not isinstance(logs, CollectorError)
             # Basic cleanup on context logs
-            logs = log_filter.filter_logs(logs)
-
-        # 4. Analyze Health
-        with console.status("[bold green]Diagnosing system health with AI..."):
+            with profiler.span("filter", data=logs) as span:
+                logs = log_filter.filter_logs(logs)
+                span.output(logs)
+
+        # 4. Correlate spikes with log events by timestamp
+        if spike_epochs and collected:
+            with profiler.span("correlate", data=logs) as span:
+                correlations = correlator.correlate(anomalies, logs)
+                span.output(pairs=len(correlations))
+            linked = sum(1 for pair in correlations if pair["total_events"])
+            console.print(f"[dim]Correlated {linked}/{len(correlations)} spike(s) with log events.[/dim]")
+
+        # 5. Analyze Health
+        with console.status("[bold green]Diagnosing system health with AI..."), profiler.span("analyze", data=logs):
             analyzer = LogAnalyzer(Config.OPENROUTER_API_KEY, Config.OPENROUTER_BASE_URL)
-            analysis = analyzer.analyze_health(specs, metrics, logs, args.model)
+            analysis = analyzer.analyze_health(specs, metrics, logs, args.model, correlations=correlations)
 
-        # 5. Report
+        # 6. Report
+        if args.format == "jsonl":
+            emit_record("monitor_summary", overall_status=analysis.get("overall_status", "Unknown"), specs=specs,
+                        summary=metrics.get("summary", {}), anomalies=len(anomalies), diagnosis=analysis.get("summary"),
+                        findings=analysis.get("findings", []))
         console.print(Panel(f"[bold]{analysis.get('overall_status', 'Unknown')}[/bold]\n\n{analysis.get('summary')}", title="Health Diagnosis", border_style="green" if analysis.get('overall_status') == "Healthy" else "red"))
 
         for finding in analysis.get('findings', []):
@@ -260,6 +723,10 @@ def main():
 
     # --- Generation Mode ---
     if args.generate:
+        from pathlib import Path
+        from rich.prompt import Confirm
+        from src.analyzer import LogAnalyzer
+
         if not args.prompt:
             console.print("[bold red]Error:[/bold red] You must provide a --prompt when using --generate.")
             sys.exit(1)
@@ -301,46 +768,48 @@ def main():
 
     # --- Config Check Mode ---
     if args.config:
+        from src.analyzer import LogAnalyzer
+        from src.auditor import ConfigAuditor, expand_config_targets
+
         console.rule("[bold cyan]Analyzing Configuration[/bold cyan]")
-        console.print(f"File: [dim]{args.config}[/dim]")
+        # 1. Collect
+        with profiler.span("discover") as span:
+            paths = expand_config_targets(args.config)
+            span.output(files=len(paths))
+        if not paths:
+            console.print(f"[bold red]Error: No configuration files found in {', '.join(args.config)}.[/bold red]")
+            sys.exit(1)
+        if len(paths) == 1:
+            console.print(f"File: [dim]{paths[0]}[/dim]")
+        else:
+            console.print(f"Files: [dim]{len(paths)} (up to {args.jobs} in parallel)[/dim]")
         if args.prompt:
             console.print(f"Focus: [dim]{args.prompt}[/dim]")
 
-        # 1. Collect
-        content = LogCollector.read_file(args.config)
-        if content.startswith("Error"):
-            console.print(f"[bold red]{content}[/bold red]")
-            sys.exit(1)
-            
         # 2. Analyze
-        with console.status(f"[bold green]Auditing configuration with AI..."):
-            analyzer = LogAnalyzer(Config.OPENROUTER_API_KEY, Config.OPENROUTER_BASE_URL)
-            analysis = analyzer.analyze_config(content, args.config, args.model, args.prompt)
-            
+        analyzer = LogAnalyzer(Config.OPENROUTER_API_KEY, Config.OPENROUTER_BASE_URL)
+        auditor = ConfigAuditor(analyzer, args.model, args.prompt, jobs=args.jobs, force=args.force)
+        results = auditor.audit(paths)
+        if len(results) == 1 and results[0]["status"] == "error":
+            console.print(f"[bold red]{results[0]['summary']}[/bold red]")
+            sys.exit(1)
+
         # 3. Report Results
-        has_issues = analysis.get("has_issues", False)
-        summary = analysis.get("summary", "Analysis complete.")
-        
-        border_style = "red" if has_issues else "green"
-        console.print(Panel(summary, title="Config Audit Result", border_style=border_style))
-        
-        findings = analysis.get("findings", [])
-        if not findings:
-            console.print("[bold green]No issues found. Configuration looks good.[/bold green]")
-        else:
-            for i, finding in enumerate(findings, 1):
-                severity = finding.get('severity', 'info')
-                color = "red" if severity in ['critical', 'high'] else "yellow"
-                
-                console.print(f"\n[{color}][bold]{i}. {finding.get('issue')} ({severity.upper()})[/bold][/{color}]")
-                if finding.get('line_number'):
-                    console.print(f"   [dim]Line: {finding.get('line_number')}[/dim]")
-                if finding.get('parameter'):
-                    console.print(f"   [dim]Parameter: {finding.get('parameter')}[/dim]")
-                
-                console.print(f"   [bold]Suggestion:[/bold] {finding.get('suggestion')}")
-                if finding.get('suggested_value'):
-                    console.print(f"   [bold blue]Recommended Value:[/bold blue] {finding.get('suggested_value')}")
+        if args.format == "jsonl":
+            for result in results:
+                emit_record("config_audit", path=result["path"], status=result["status"],
+                            has_issues=result["has_issues"], summary=result["summary"], findings=result["findings"])
+
+        if len(results) > 1:
+            print_config_overview(results)
+
+        for result in results:
+            if len(results) > 1 and not result["has_issues"]:
+                continue
+            border_style = "red" if result["has_issues"] else "green"
+            title = "Config Audit Result" if len(results) == 1 else f"Config Audit: {result['path']}"
+            console.print(Panel(result["summary"], title=title, border_style=border_style))
+            print_config_findings(result["findings"])
 
         sys.exit(0)
     # -------------------------
@@ -360,18 +829,88 @@ def main():
         sources_to_check[selected_key] = Config.COMMON_LOGS[selected_key]
 
     elif args.source == "all":
-        sources_to_check = Config.COMMON_LOGS
+        # Only sources that exist on this host (probe results are cached)
+        from src.sources import SourceRegistry
+        registry = SourceRegistry(Config.SOURCE_PROBE_FILE, Config.SOURCE_PROBE_TTL)
+        sources_to_check, missing = registry.available(Config.COMMON_LOGS, refresh=args.reprobe)
+        for name, probe in missing.items():
+            _report(args, name, Config.COMMON_LOGS[name], "unavailable", kind=probe["kind"], detail=probe["detail"])
+        if missing and not args.headless:
+            console.print(f"[dim]Skipping {len(missing)} source(s) not present on this host: {', '.join(missing)}[/dim]")
 
     else:
         # Default single source behavior
         name = "Custom File" if args.source != "journalctl" else "System Journal"
+        if args.source.startswith(("syslog://", "syslog+tcp://")):
+            name = "Syslog Receiver"
         sources_to_check[name] = args.source
 
-    # Run Analysis Loop
-    for name, path in sources_to_check.items():
-        process_log_source(name, path, args, log_filter)
+    if args.daemon:
+        from src.daemon import LogixDaemon
+        LogixDaemon(args, log_filter, process_log_source, _create_digest, create_syslog_listener).run(sources_to_check)
+        return
+
+    from src.syslog_server import is_syslog_source
+    listeners = {name: path for name, path in sources_to_check.items() if is_syslog_source(path)}
+    if listeners and len(sources_to_check) == 1:
+        # A single listener source runs in the foreground until interrupted
+        if not args.headless:
+            console.print("[bold red]Error:[/bold red] Syslog listener sources need --cron, --daemon or --format jsonl.")
+            sys.exit(1)
+        import threading
+        from src.analyzer import LogAnalyzer
+        from src.history import HistoryManager
 
-    if not args.cron:
+        name, path = next(iter(listeners.items()))
+        digest = _create_digest() if args.cron else None
+        # One analyzer and history index for all batches
+        analyzer = LogAnalyzer(Config.OPENROUTER_API_KEY, Config.OPENROUTER_BASE_URL)
+        history = HistoryManager() if args.cron else None
+        lock = threading.Lock()
+        receiver = create_syslog_listener(name, path, args, log_filter, lock=lock, digest=digest,
+                                          analyzer=analyzer, history=history)
+        console.print(f"[bold green]Listening for syslog on {path}[/bold green] [dim](Ctrl+C to stop)[/dim]")
+        # The receiver runs on its own thread so a digest whose window has
+        # passed is delivered even while no messages arrive
+        thread = threading.Thread(target=receiver.run, name="logix-syslog", daemon=True)
+        thread.start()
+        try:
+            while thread.is_alive():
+                left = digest.time_left() if digest else None
+                thread.join(1.0 if left is None else left)
+                if digest and digest.window and digest.due():
+                    with lock:
+                        digest.flush()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            receiver.stop()
+            thread.join(receiver.batch_interval + 5)
+            if digest:
+                digest.flush()
+                digest.dispatcher.close()
+        console.print(f"[dim]Received {receiver.received} message(s), dropped {receiver.dropped}.[/dim]")
+        return
+    for name in listeners:
+        # One-shot runs cannot wait for pushed messages
+        sources_to_check.pop(name)
+        if not args.headless:
+            console.print(f"[dim]Skipping listener source {name}; it runs with --daemon or on its own.[/dim]")
+
+    # Run Analysis Loop
+    # One dispatcher per run: findings are queued in the durable outbox and
+    # delivered in the background while later sources are analyzed, coalesced
+    # into one digest per channel.
+    digest = _create_digest() if args.cron else None
+    try:
+        for name, path in sources_to_check.items():
+            process_log_source(name, path, args, log_filter, digest=digest)
+    finally:
+        if digest:
+            digest.flush()
+            digest.dispatcher.close()
+
+    if not args.headless:
         console.print("\n[bold green]All checks complete.[/bold green]")
 
 if __name__ == "__main__":
@@ -1,8 +1,10 @@
+import os
 import time
 import psutil
 import platform
 import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+from src.anomaly import AnomalyDetector
 
 class SystemMonitor:
     def __init__(self):
@@ -30,10 +32,34 @@ class SystemMonitor:
         except Exception as e:
             return {"error": f"Failed to gather specs: {str(e)}"}
 
-    def monitor_performance(self, duration: int = 60, interval: int = 5) -> Dict[str, Any]:
+    def take_snapshot(self) -> Dict[str, Any]:
+        """
+        Captures a single performance sample.
+        CPU percent is measured since the previous call.
+        """
+        now = datetime.datetime.now()
+        snapshot = {
+            "timestamp": now.strftime("%H:%M:%S"),
+            "epoch": now.timestamp(),
+            "cpu_percent": psutil.cpu_percent(interval=None),
+            "memory_percent": psutil.virtual_memory().percent,
+            "disk_io": None, # Complex to diff, skipping for simple version
+            "net_io": None   # Complex to diff
+        }
+
+        # Add Load Avg if on Unix
+        if hasattr(os, 'getloadavg'):
+            snapshot['load_avg'] = os.getloadavg()
+
+        return snapshot
+
+    def monitor_performance(self, duration: int = 60, interval: int = 5, detector: Optional[AnomalyDetector] = None) -> Dict[str, Any]:
         """
         Monitors system performance for a set duration.
+        Each sample is scored by the anomaly detector as it arrives.
         """
+        if detector is None:
+            detector = AnomalyDetector()
         samples = []
         start_time = time.time()
         
@@ -45,24 +71,19 @@ class SystemMonitor:
             time.sleep(interval)
             
             try:
-                # Capture snapshot
-                snapshot = {
-                    "timestamp": datetime.datetime.now().strftime("%H:%M:%S"),
-                    "cpu_percent": psutil.cpu_percent(interval=None),
-                    "memory_percent": psutil.virtual_memory().percent,
-                    "disk_io": None, # Complex to diff, skipping for simple version
-                    "net_io": None   # Complex to diff
-                }
-                
-                # Add Load Avg if on Unix
-                if hasattr(os, 'getloadavg'):
-                    snapshot['load_avg'] = os.getloadavg()
-
+                snapshot = self.take_snapshot()
                 samples.append(snapshot)
+                detector.observe(snapshot)
             except Exception:
                 continue
-                
-        # Calculate summary
+
+        return self.summarize(samples, duration, interval, detector)
+
+    @staticmethod
+    def summarize(samples: List[Dict[str, Any]], duration: int, interval: int, detector: AnomalyDetector) -> Dict[str, Any]:
+        """
+        Builds the metrics report for a list of samples already fed to `detector`.
+        """
         if not samples:
             return {"error": "No data collected"}
 
@@ -74,10 +95,10 @@ class SystemMonitor:
             "duration": duration,
             "interval": interval,
             "samples": samples,
+            "anomalies": detector.get_windows(),
             "summary": {
                 "avg_cpu_usage": f"{avg_cpu:.1f}%",
                 "max_cpu_usage": f"{max_cpu:.1f}%",
                 "avg_mem_usage": f"{avg_mem:.1f}%",
             }
         }
-import os
\ No newline at end of file
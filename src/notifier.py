@@ -1,11 +1,70 @@
+import queue
 import smtplib
+import threading
+import time
 import requests
 from email.mime.text import MIMEText
+from rich.console import Console
 from src.config import Config
+from src.outbox import NotificationOutbox
+from src.profiler import profiler
+
+console = Console()
 
 class Notifier:
+    TIMEOUT = 10        # seconds per HTTP request / SMTP operation
+    MAX_RETRIES = 3
+    BACKOFF_BASE = 1.0  # seconds, doubled on each retry
+
     def __init__(self):
         self.config = Config
+        # Shared across all webhooks of a run so TLS/keep-alive is set up once
+        self.session = requests.Session()
+        self._smtp = None
+
+    @staticmethod
+    def _format_fix(finding) -> str:
+        fix = finding.get('suggested_fix')
+        if isinstance(fix, dict):
+            text = fix.get('description') or 'None'
+            if fix.get('command'):
+                text += f"\n`{fix['command']}`"
+            return text
+        return str(fix) if fix else 'None'
+
+    def _post_discord(self, message) -> bool:
+        """
+        Posts a webhook payload, retrying on network errors, 5xx and 429.
+        Rate limits honor Discord's `retry_after` instead of the local backoff.
+        """
+        last_error = None
+        for attempt in range(self.MAX_RETRIES + 1):
+            delay = self.BACKOFF_BASE * (2 ** attempt)
+            try:
+                response = self.session.post(self.config.DISCORD_WEBHOOK_URL, json=message, timeout=self.TIMEOUT)
+                if response.status_code == 429:
+                    try:
+                        delay = float(response.json().get('retry_after', delay))
+                    except ValueError:
+                        delay = float(response.headers.get('Retry-After', delay))
+                    last_error = "rate limited"
+                elif response.status_code >= 500:
+                    last_error = f"HTTP {response.status_code}"
+                else:
+                    response.raise_for_status()
+                    return True
+            except requests.HTTPError as e:
+                # 4xx other than 429 will not succeed on retry
+                console.print(f"[bold red]Failed to send Discord webhook:[/bold red] {e}")
+                return False
+            except requests.RequestException as e:
+                last_error = e
+
+            if attempt < self.MAX_RETRIES:
+                time.sleep(delay)
+
+        console.print(f"[bold red]Failed to send Discord webhook after {self.MAX_RETRIES + 1} attempts:[/bold red] {last_error}")
+        return False
 
     def send_discord(self, finding):
         if not self.config.DISCORD_WEBHOOK_URL:
@@ -15,7 +74,7 @@ class Notifier:
             "embeds": [
                 {
                     "title": f"Logix Alert: {finding.get('severity', 'Unknown').upper()}",
-                    "description": finding.get('findings', 'No details provided.'),
+                    "description": finding.get('explanation') or finding.get('findings', 'No details provided.'),
                     "color": 15158332 if finding.get('severity') == 'critical' else 15105570,
                     "fields": [
                         {
@@ -24,7 +83,7 @@ class Notifier:
                         },
                         {
                             "name": "Suggested Fix",
-                            "value": finding.get('suggested_fix', 'None')
+                            "value": self._format_fix(finding)[:1024]
                         }
                     ],
                     "footer": {
@@ -34,13 +93,31 @@ class Notifier:
             ]
         }
 
-        try:
-            response = requests.post(self.config.DISCORD_WEBHOOK_URL, json=message)
-            response.raise_for_status()
-            return True
-        except Exception as e:
-            print(f"Failed to send Discord webhook: {e}")
-            return False
+        return self._post_discord(message)
+
+    def _smtp_connection(self):
+        """Returns the run's SMTP connection, connecting and logging in on first use."""
+        if self._smtp is None:
+            server = smtplib.SMTP(self.config.SMTP_SERVER, self.config.SMTP_PORT, timeout=self.TIMEOUT)
+            server.starttls()
+            server.login(self.config.SMTP_USER, self.config.SMTP_PASSWORD)
+            self._smtp = server
+        return self._smtp
+
+    def _send_mail(self, msg) -> bool:
+        for attempt in range(2):
+            try:
+                self._smtp_connection().send_message(msg)
+                return True
+            except (smtplib.SMTPServerDisconnected, OSError) as e:
+                # Server dropped the reused connection; reconnect once
+                self._smtp = None
+                if attempt == 1:
+                    console.print(f"[bold red]Failed to send email:[/bold red] {e}")
+            except Exception as e:
+                console.print(f"[bold red]Failed to send email:[/bold red] {e}")
+                return False
+        return False
 
     def send_email(self, finding):
         if not all([self.config.SMTP_SERVER, self.config.SMTP_USER, self.config.SMTP_PASSWORD, self.config.SMTP_TO]):
@@ -49,15 +126,15 @@ class Notifier:
         subject = f"[Logix] {finding.get('severity', 'Alert').title()}: Issue Detected"
         body = f"""
         Logix has detected an issue.
-        
+
         Severity: {finding.get('severity')}
-        Findings: {finding.get('findings')}
-        
+        Findings: {finding.get('explanation') or finding.get('findings')}
+
         Log Entry:
         {finding.get('log_entry')}
-        
+
         Suggested Fix:
-        {finding.get('suggested_fix')}
+        {self._format_fix(finding)}
         """
 
         msg = MIMEText(body)
@@ -65,23 +142,246 @@ class Notifier:
         msg['From'] = self.config.SMTP_FROM or self.config.SMTP_USER
         msg['To'] = self.config.SMTP_TO
 
-        try:
-            with smtplib.SMTP(self.config.SMTP_SERVER, self.config.SMTP_PORT) as server:
-                server.starttls()
-                server.login(self.config.SMTP_USER, self.config.SMTP_PASSWORD)
-                server.send_message(msg)
-            return True
-        except Exception as e:
-            print(f"Failed to send email: {e}")
-            return False
+        return self._send_mail(msg)
+
+    # Discord embed limits
+    EMBED_FIELDS = 25
+    EMBEDS_PER_MESSAGE = 10
+    MESSAGE_CHARS = 6000
+    SEVERITY_ORDER = ["critical", "error", "warning", "info"]
+
+    @classmethod
+    def _group(cls, entries):
+        """Groups digest entries by (severity, source), most severe first."""
+        groups = {}
+        for finding in entries:
+            key = (finding.get('severity', 'info'), finding.get('source', 'Unknown'))
+            groups.setdefault(key, []).append(finding)
+        rank = {sev: i for i, sev in enumerate(cls.SEVERITY_ORDER)}
+        return sorted(groups.items(), key=lambda item: (rank.get(item[0][0], len(rank)), item[0][1]))
+
+    def send_discord_digest(self, entries):
+        """
+        Sends many findings as few webhook messages: one embed per
+        severity/source group, split to stay within Discord's size limits.
+        Returns the indices of the entries whose message was delivered, so
+        a failed part can be retried without reposting the others.
+        """
+        if not self.config.DISCORD_WEBHOOK_URL:
+            return []
+
+        def embed_size(embed):
+            return len(embed["title"]) + len(embed["footer"]["text"]) + sum(
+                len(f["name"]) + len(f["value"]) for f in embed["fields"])
+
+        index = {id(finding): i for i, finding in enumerate(entries)}
+        embeds = []   # (embed, indices of the entries in it)
+        for (severity, source), findings in self._group(entries):
+            embed = None
+            for finding in findings:
+                name = (finding.get('explanation') or finding.get('findings') or 'Issue detected')[:256]
+                value = f"```\n{finding.get('log_entry', '')[:300]}\n```"
+                # Start a new embed when the field count or size budget is used up
+                if embed is None or len(embed["fields"]) >= self.EMBED_FIELDS or \
+                        embed_size(embed) + len(name) + len(value) > self.MESSAGE_CHARS // 2:
+                    embed = {
+                        "title": f"{severity.upper()}: {source} ({len(findings)})"[:256],
+                        "color": 15158332 if severity == 'critical' else 15105570,
+                        "fields": [],
+                        "footer": {"text": "Logix Automated Agent"},
+                    }
+                    embeds.append((embed, []))
+                embed["fields"].append({"name": name, "value": value})
+                embeds[-1][1].append(index[id(finding)])
+
+        delivered = []
+        batch, batch_entries, batch_size = [], [], 0
+
+        def post():
+            if self._post_discord({"content": f"Logix digest: {len(entries)} new finding(s)", "embeds": batch}):
+                delivered.extend(batch_entries)
+
+        for embed, embed_entries in embeds:
+            size = embed_size(embed)
+            if batch and (len(batch) >= self.EMBEDS_PER_MESSAGE or batch_size + size > self.MESSAGE_CHARS):
+                post()
+                batch, batch_entries, batch_size = [], [], 0
+            batch.append(embed)
+            batch_entries.extend(embed_entries)
+            batch_size += size
+        if batch:
+            post()
+        return sorted(delivered)
+
+    def send_email_digest(self, entries):
+        """Sends all findings as one email; returns the indices delivered (all or none)."""
+        if not all([self.config.SMTP_SERVER, self.config.SMTP_USER, self.config.SMTP_PASSWORD, self.config.SMTP_TO]):
+            return []
+
+        worst = next((sev for sev in self.SEVERITY_ORDER if any(f.get('severity') == sev for f in entries)), 'info')
+        subject = f"[Logix] Digest: {len(entries)} new finding(s), worst {worst}"
+
+        sections = []
+        for (severity, source), findings in self._group(entries):
+            lines = [f"== {severity.upper()} / {source} ({len(findings)}) =="]
+            for finding in findings:
+                lines.append(f"- {finding.get('explanation') or finding.get('findings')}")
+                lines.append(f"  Log: {finding.get('log_entry')}")
+                lines.append(f"  Fix: {self._format_fix(finding)}")
+            sections.append("\n".join(lines))
+        body = "Logix has detected the following issues.\n\n" + "\n\n".join(sections)
+
+        msg = MIMEText(body)
+        msg['Subject'] = subject
+        msg['From'] = self.config.SMTP_FROM or self.config.SMTP_USER
+        msg['To'] = self.config.SMTP_TO
+
+        return list(range(len(entries))) if self._send_mail(msg) else []
+
+    def notify_digest(self, entries):
+        """Sends one digest per configured channel."""
+        results = {}
+        if self.config.DISCORD_WEBHOOK_URL:
+            results['discord'] = len(self.send_discord_digest(entries)) == len(entries)
+
+        if self.config.SMTP_SERVER:
+            results['email'] = len(self.send_email_digest(entries)) == len(entries)
+
+        return results
 
     def notify_all(self, finding):
         """Attempts to send notifications via all configured channels."""
         results = {}
         if self.config.DISCORD_WEBHOOK_URL:
             results['discord'] = self.send_discord(finding)
-        
+
         if self.config.SMTP_SERVER:
             results['email'] = self.send_email(finding)
-            
+
         return results
+
+    def channel_senders(self):
+        """
+        Maps each configured channel to its (single finding, digest) senders.
+        Single senders return success; digest senders the delivered indices.
+        """
+        senders = {}
+        if self.config.DISCORD_WEBHOOK_URL:
+            senders['discord'] = (self.send_discord, self.send_discord_digest)
+
+        if self.config.SMTP_SERVER:
+            senders['email'] = (self.send_email, self.send_email_digest)
+
+        return senders
+
+    def close(self):
+        """Closes the pooled HTTP session and SMTP connection."""
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except Exception:
+                pass
+            self._smtp = None
+        self.session.close()
+
+
+class NotificationDispatcher:
+    """
+    Drains the notification outbox on a background thread so slow webhooks
+    or SMTP servers do not stall the analysis pipeline. A single worker owns
+    the Notifier, so its session and SMTP connection are never shared across
+    threads.
+    """
+    _STOP = object()
+
+    def __init__(self, outbox: NotificationOutbox, notifier: Notifier = None, immediate=("critical",), budget: float = 60):
+        self.outbox = outbox
+        self.notifier = notifier or Notifier()
+        self.immediate = immediate
+        self.budget = budget
+        self._queue = queue.Queue()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, name="logix-notifier", daemon=True)
+        self._worker.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                break
+            with self._lock:
+                self._pending.discard(item)
+            try:
+                with profiler.span("deliver", urgent_only=item == "urgent"):
+                    stats = self.outbox.drain(self.notifier, immediate=self.immediate, deadline=time.monotonic() + self.budget,
+                                              urgent_only=item == "urgent")
+                if stats["dead"]:
+                    console.print(f"[bold red]Gave up on {stats['dead']} notification(s)[/bold red] after "
+                                  f"{self.outbox.MAX_ATTEMPTS} failed attempts [dim](kept in {self.outbox.path})[/dim]")
+            except Exception as e:
+                console.print(f"[bold red]Notification failed:[/bold red] {e}")
+
+    def request_drain(self, urgent_only: bool = False):
+        """
+        Asks the worker to deliver whatever is due (only the `immediate`
+        severities with `urgent_only`). Returns immediately.
+        """
+        mode = "urgent" if urgent_only else "full"
+        # Requests made while one covering them is already queued are folded into it
+        with self._lock:
+            if "full" in self._pending or mode in self._pending:
+                return
+            self._pending.add(mode)
+        self._queue.put(mode)
+
+    def close(self, timeout: float = 60):
+        """Waits (up to `timeout` seconds) for queued drains, then releases connections."""
+        self._queue.put(self._STOP)
+        self._worker.join(timeout)
+        if not self._worker.is_alive():
+            self.notifier.close()
+
+
+class AlertDigest:
+    """
+    Coalesces findings into digests instead of one notification each.
+
+    Findings are written to the outbox immediately and delivered as one
+    digest per channel when `flush` is called (end of a cron run) or once
+    `window` seconds have passed since the first buffered finding.
+    Severities in the dispatcher's `immediate` list trigger delivery at once.
+    """
+    def __init__(self, dispatcher: NotificationDispatcher, window: int = 0):
+        self.dispatcher = dispatcher
+        self.window = window
+        self._opened = None
+
+    def add(self, finding, source: str):
+        finding = dict(finding, source=source)
+        self.dispatcher.outbox.enqueue(finding, list(self.dispatcher.notifier.channel_senders()))
+
+        if finding.get('severity') in self.dispatcher.immediate:
+            # Buffered findings stay for the digest
+            self.dispatcher.request_drain(urgent_only=True)
+            return
+
+        if self._opened is None:
+            self._opened = time.monotonic()
+        if self.window and self.due():
+            self.flush()
+
+    def due(self) -> bool:
+        """True once `window` seconds have passed since the first buffered finding."""
+        return self._opened is not None and time.monotonic() - self._opened >= self.window
+
+    def time_left(self):
+        """Seconds until the window closes; None without a window or buffered findings."""
+        if not self.window or self._opened is None:
+            return None
+        return max(0.0, self.window - (time.monotonic() - self._opened))
+
+    def flush(self):
+        """Delivers everything due, including findings left over from earlier runs."""
+        self.dispatcher.request_drain()
+        self._opened = None
@@ -0,0 +1,162 @@
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Any
+
+
+class NotificationOutbox:
+    """
+    Crash-safe, append-only queue of notifications waiting for delivery.
+
+    Findings are written here (one row per channel) before anything is sent,
+    so an outage or a crash between analysis and delivery cannot lose an
+    alert. `drain` delivers due rows in batches and reschedules failures with
+    exponential backoff for a later run. Rows that still fail after
+    MAX_ATTEMPTS (e.g. a payload the channel always rejects) are marked
+    dead and kept for inspection instead of being retried forever.
+    """
+    BACKOFF_BASE = 60        # seconds before the first retry
+    MAX_BACKOFF = 6 * 3600
+    MAX_ATTEMPTS = 10        # about 14 hours of retries with the backoff above
+
+    def __init__(self, path: str = "data/outbox.db"):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        with self._connect() as db:
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    channel TEXT NOT NULL,
+                    severity TEXT,
+                    payload TEXT NOT NULL,
+                    created REAL NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt REAL NOT NULL DEFAULT 0,
+                    delivered REAL,
+                    dead REAL
+                )
+            """)
+            columns = [row[1] for row in db.execute("PRAGMA table_info(outbox)")]
+            if "dead" not in columns:
+                db.execute("ALTER TABLE outbox ADD COLUMN dead REAL")
+            db.execute("CREATE INDEX IF NOT EXISTS outbox_pending ON outbox (channel, delivered, next_attempt)")
+
+    @contextmanager
+    def _connect(self):
+        # A connection per operation keeps the outbox safe to use from the
+        # dispatcher thread and the pipeline at the same time.
+        db = sqlite3.connect(self.path, timeout=30)
+        try:
+            db.execute("PRAGMA journal_mode=WAL")
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def enqueue(self, finding: Dict[str, Any], channels: List[str]) -> int:
+        """Durably records `finding` for each channel. Returns the number of rows added."""
+        now = time.time()
+        payload = json.dumps(finding)
+        with self._connect() as db:
+            db.executemany(
+                "INSERT INTO outbox (channel, severity, payload, created) VALUES (?, ?, ?, ?)",
+                [(channel, finding.get('severity'), payload, now) for channel in channels],
+            )
+        return len(channels)
+
+    def pending_count(self) -> int:
+        with self._connect() as db:
+            return db.execute("SELECT COUNT(*) FROM outbox WHERE delivered IS NULL AND dead IS NULL").fetchone()[0]
+
+    def dead_count(self) -> int:
+        with self._connect() as db:
+            return db.execute("SELECT COUNT(*) FROM outbox WHERE dead IS NOT NULL").fetchone()[0]
+
+    def _due(self, db, channel: str, limit: int, severities=None):
+        query = ("SELECT id, severity, payload, attempts FROM outbox "
+                 "WHERE channel = ? AND delivered IS NULL AND dead IS NULL AND next_attempt <= ?")
+        params = [channel, time.time()]
+        if severities is not None:
+            query += f" AND severity IN ({', '.join('?' * len(severities))})"
+            params += list(severities)
+        rows = db.execute(query + " ORDER BY id LIMIT ?", params + [limit]).fetchall()
+        return [(row[0], row[1], json.loads(row[2]), row[3]) for row in rows]
+
+    def _mark(self, rows, ok: bool) -> int:
+        """Records the outcome of a delivery; returns how many rows were given up on."""
+        now = time.time()
+        with self._connect() as db:
+            if ok:
+                db.executemany("UPDATE outbox SET delivered = ? WHERE id = ?", [(now, row[0]) for row in rows])
+                return 0
+            dead = [row for row in rows if row[3] + 1 >= self.MAX_ATTEMPTS]
+            retry = [row for row in rows if row[3] + 1 < self.MAX_ATTEMPTS]
+            db.executemany("UPDATE outbox SET attempts = attempts + 1, dead = ? WHERE id = ?",
+                           [(now, row[0]) for row in dead])
+            db.executemany(
+                "UPDATE outbox SET attempts = attempts + 1, next_attempt = ? WHERE id = ?",
+                [(now + min(self.BACKOFF_BASE * (2 ** row[3]), self.MAX_BACKOFF), row[0]) for row in retry],
+            )
+        return len(dead)
+
+    def drain(self, notifier, batch_size: int = 50, immediate=("critical",), deadline: float = None,
+              urgent_only: bool = False) -> Dict[str, int]:
+        """
+        Delivers due notifications through `notifier`.
+        Severities in `immediate` are sent one by one; everything else is
+        coalesced into digests of up to `batch_size` findings (the digest
+        sender returns which of them were delivered). With
+        `urgent_only`, only the `immediate` severities are delivered and the
+        rest waits for the next full drain. Stops starting new batches once
+        `deadline` (time.monotonic) has passed; whatever is left stays
+        queued. Returns delivered/failed/dead row counts.
+        """
+        senders = notifier.channel_senders()
+        stats = {"delivered": 0, "failed": 0, "dead": 0}
+        immediate = set(immediate)
+        severities = sorted(immediate) if urgent_only else None
+        if severities == []:
+            return stats
+
+        for channel, (send_one, send_digest) in senders.items():
+            failing = False
+            while not failing and (deadline is None or time.monotonic() < deadline):
+                with self._connect() as db:
+                    rows = self._due(db, channel, batch_size, severities)
+                if not rows:
+                    break
+
+                urgent = [row for row in rows if row[1] in immediate]
+                rest = [row for row in rows if row[1] not in immediate]
+                for row in urgent:
+                    ok = send_one(row[2])
+                    stats["dead"] += self._mark([row], ok)
+                    stats["delivered" if ok else "failed"] += 1
+                    failing = failing or not ok
+                if rest:
+                    # A digest can go out as several messages; only the rows
+                    # of the parts that failed are retried
+                    sent = set(send_digest([row[2] for row in rest]))
+                    delivered = [row for i, row in enumerate(rest) if i in sent]
+                    failed = [row for i, row in enumerate(rest) if i not in sent]
+                    if delivered:
+                        self._mark(delivered, True)
+                    if failed:
+                        stats["dead"] += self._mark(failed, False)
+                    stats["delivered"] += len(delivered)
+                    stats["failed"] += len(failed)
+                    # A failing channel keeps the remainder for the next drain
+                    failing = failing or bool(failed)
+
+        return stats
+
+    def prune(self, days: int = 7):
+        """Deletes delivered and dead rows older than `days`."""
+        cutoff = time.time() - days * 86400
+        with self._connect() as db:
+            db.execute("DELETE FROM outbox WHERE (delivered IS NOT NULL AND delivered < ?) OR (dead IS NOT NULL AND dead < ?)",
+                       (cutoff, cutoff))
@@ -0,0 +1,29 @@
+import json
+import sys
+from datetime import datetime
+
+# Stream records are written to; see records_only
+_records = None
+
+
+def records_only():
+    """
+    Reserves stdout for records (`--format jsonl`): everything else written
+    to sys.stdout afterwards (rich consoles, print) goes to stderr instead.
+    """
+    global _records
+    if _records is None:
+        _records = sys.stdout
+        sys.stdout = sys.stderr
+
+
+def emit_record(record_type: str, **fields):
+    """
+    Writes one JSON object per line to stdout (`--format jsonl`) and flushes,
+    so downstream tools see each record as soon as it is produced.
+    """
+    record = {"type": record_type, "time": datetime.now().astimezone().isoformat(timespec="seconds")}
+    record.update(fields)
+    stream = _records or sys.stdout
+    stream.write(json.dumps(record, default=str) + "\n")
+    stream.flush()
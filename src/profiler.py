@@ -0,0 +1,220 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, List, Optional
+
+
+class Span:
+    """Measurements of one timed stage; callers fill in what came out of it."""
+    __slots__ = ("name", "category", "fields")
+
+    def __init__(self, name: str, category: str, fields: dict):
+        self.name = name
+        self.category = category
+        self.fields = fields
+
+    def output(self, data: Optional[str] = None, **fields):
+        """Records the bytes/lines a stage produced (and any extra fields)."""
+        if data is not None:
+            self.fields["bytes_out"] = len(data.encode("utf-8", "replace"))
+            self.fields["lines_out"] = data.count("\n") + (1 if data and not data.endswith("\n") else 0)
+        self.fields.update(fields)
+
+
+class _NullSpan:
+    def output(self, data=None, **fields):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Profiler:
+    """
+    Collects timed spans (wall time, thread CPU time, CPU time of waited-for
+    child processes, bytes/lines in and out) for the pipeline stages. While
+    disabled, `span` is a no-op, so stages are instrumented unconditionally.
+
+    The module-level `profiler` instance is enabled by `--profile`; `report`
+    prints a per-stage summary and writes a Chrome trace (chrome://tracing,
+    Perfetto). With `cprofile`, stages also run under cProfile and the
+    hottest one is dumped as a .prof file.
+
+    Only the last MAX_SPANS spans are kept, so a long-running daemon with
+    --profile does not grow without bound; `dropped` counts the rest.
+    """
+    MAX_SPANS = 100000
+
+    def __init__(self):
+        self.enabled = False
+        self.cprofile = False
+        self.trace_file = None
+        self.spans: Deque[dict] = deque(maxlen=self.MAX_SPANS)
+        self.dropped = 0
+        self._profiles: Dict[str, "cProfile.Profile"] = {}
+        self._profiling = threading.Lock()
+        self._origin = 0.0
+
+    def enable(self, trace_file: str, cprofile: bool = False):
+        self.enabled = True
+        self.cprofile = cprofile
+        self.trace_file = trace_file
+        self._origin = time.perf_counter()
+
+    def _start_cprofile(self, name: str):
+        # Only one cProfile profiler can be active at a time
+        if not self._profiling.acquire(blocking=False):
+            return None
+        import cProfile
+        profile = self._profiles.setdefault(name, cProfile.Profile())
+        try:
+            profile.enable()
+        except ValueError:
+            self._profiling.release()
+            return None
+        return profile
+
+    @contextmanager
+    def span(self, name: str, category: str = "stage", data: Optional[str] = None, profile: bool = True, **fields):
+        """
+        Times the enclosed block as stage `name`. `data` is the stage input
+        (its size is recorded); call `.output(...)` on the yielded span to
+        record the output. Nested spans are allowed; `profile=False` keeps
+        an enclosing span from taking the cProfile slot from its children.
+        """
+        if not self.enabled:
+            yield _NULL_SPAN
+            return
+
+        if data is not None:
+            fields["bytes_in"] = len(data.encode("utf-8", "replace"))
+            fields["lines_in"] = data.count("\n") + (1 if data and not data.endswith("\n") else 0)
+        span = Span(name, category, fields)
+        profile = self._start_cprofile(name) if self.cprofile and profile else None
+
+        children = os.times()
+        cpu = time.thread_time()
+        start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            wall = time.perf_counter() - start
+            cpu = time.thread_time() - cpu
+            after = os.times()
+            if profile is not None:
+                profile.disable()
+                self._profiling.release()
+            if len(self.spans) == self.spans.maxlen:
+                self.dropped += 1
+            self.spans.append({
+                "name": name,
+                "category": category,
+                "start": start - self._origin,
+                "wall": wall,
+                "cpu": cpu,
+                "child_cpu": (after.children_user + after.children_system) - (children.children_user + children.children_system),
+                "thread": threading.get_ident(),
+                "fields": span.fields,
+            })
+
+    def stages(self) -> List[dict]:
+        """Spans aggregated per stage name, slowest (total wall time) first."""
+        stages = {}
+        for span in self.spans:
+            stage = stages.setdefault(span["name"], {
+                "name": span["name"], "category": span["category"], "calls": 0, "wall": 0.0, "max_wall": 0.0,
+                "cpu": 0.0, "child_cpu": 0.0, "bytes_in": 0, "bytes_out": 0, "lines_in": 0, "lines_out": 0,
+            })
+            stage["calls"] += 1
+            stage["wall"] += span["wall"]
+            stage["max_wall"] = max(stage["max_wall"], span["wall"])
+            stage["cpu"] += span["cpu"]
+            stage["child_cpu"] += span["child_cpu"]
+            for key in ("bytes_in", "bytes_out", "lines_in", "lines_out"):
+                stage[key] += span["fields"].get(key, 0)
+        return sorted(stages.values(), key=lambda s: s["wall"], reverse=True)
+
+    def write_trace(self, path: str):
+        """Writes the spans in Chrome trace event format."""
+        pid = os.getpid()
+        events = [{
+            "name": span["name"],
+            "cat": span["category"],
+            "ph": "X",
+            "ts": round(span["start"] * 1e6, 1),
+            "dur": round(span["wall"] * 1e6, 1),
+            "pid": pid,
+            "tid": span["thread"],
+            "args": dict(span["fields"], cpu_ms=round(span["cpu"] * 1000, 3),
+                         child_cpu_ms=round(span["child_cpu"] * 1000, 3)),
+        } for span in self.spans]
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, default=str)
+
+    def dump_hottest(self, stages: List[dict]) -> Optional[tuple]:
+        """Saves the cProfile stats of the slowest profiled stage; returns (stage, path)."""
+        for stage in stages:
+            profile = self._profiles.get(stage["name"])
+            if profile is None:
+                continue
+            base, _ = os.path.splitext(self.trace_file)
+            path = f"{base}.{stage['name'].replace('/', '_')}.prof"
+            profile.dump_stats(path)
+            return stage["name"], path
+        return None
+
+    def report(self, console):
+        """Prints the per-stage summary and writes the trace (and cProfile dump)."""
+        if not self.enabled or not self.spans:
+            return
+        from rich.table import Table
+
+        total = time.perf_counter() - self._origin
+        stages = self.stages()
+        caption = "Times in ms (Child: CPU of child processes), In/Out in KiB/lines"
+        if self.dropped:
+            caption += f"; last {len(self.spans)} spans only ({self.dropped} older ones dropped)"
+        table = Table(title=f"Pipeline Profile ({total:.2f}s total)", caption=caption)
+        table.add_column("Stage", no_wrap=True)
+        for column in ("Calls", "Wall", "% Run", "Max", "CPU", "Child", "In", "Out"):
+            table.add_column(column, justify="right", overflow="fold")
+
+        def size(byte_count, line_count):
+            if not byte_count and not line_count:
+                return "-"
+            return f"{byte_count / 1024:.1f} / {line_count}"
+
+        for stage in stages:
+            table.add_row(
+                stage["name"] if stage["category"] == "stage" else f"[dim]{stage['name']}[/dim]",
+                str(stage["calls"]),
+                f"{stage['wall'] * 1000:.1f}",
+                f"{100 * stage['wall'] / total:.0f}%" if total else "-",
+                f"{stage['max_wall'] * 1000:.1f}",
+                f"{stage['cpu'] * 1000:.1f}",
+                f"{stage['child_cpu'] * 1000:.1f}",
+                size(stage["bytes_in"], stage["lines_in"]),
+                size(stage["bytes_out"], stage["lines_out"]),
+            )
+        console.print(table)
+
+        try:
+            self.write_trace(self.trace_file)
+            console.print(f"[dim]Trace written to {self.trace_file} (open in chrome://tracing or ui.perfetto.dev)[/dim]")
+            if self.cprofile:
+                hottest = self.dump_hottest(stages)
+                if hottest:
+                    console.print(f"[dim]cProfile stats of the hottest stage ({hottest[0]}) written to {hottest[1]} "
+                                  f"(python -m pstats {hottest[1]})[/dim]")
+        except OSError as e:
+            console.print(f"[bold red]Failed to write profile:[/bold red] {e}")
+
+
+profiler = Profiler()
@@ -0,0 +1,168 @@
+import datetime
+import mmap
+import os
+import struct
+import time
+from typing import Dict, List, Any, Optional
+
+
+class MetricsRing:
+    """
+    Fixed-size ring of performance samples backed by a memory-mapped file.
+
+    Layout: a small header (magic, version, capacity, last clock step,
+    total records written) followed by `capacity` fixed-width records. The
+    single writer fills slot `total % capacity` and then bumps `total`, so
+    readers never see a torn record. Records are normally in time order,
+    which lets `read` binary search for the start of a window instead of
+    scanning the whole file. Epochs are wall-clock time, so a clock stepped
+    backwards (NTP) breaks that order: the writer then notes the record
+    number in the header, and `read` filters linearly until that record
+    has been overwritten.
+    """
+    MAGIC = b"LGXM"
+    VERSION = 1
+    HEADER = struct.Struct("<4sIIIQ")   # magic, version, capacity, last clock step (record + 1, 0 if none), total
+    RECORD = struct.Struct("<dfff")     # epoch, cpu %, memory %, load 1m (-1 if unknown)
+    _STEP_OFFSET = 12
+
+    def __init__(self, path: str, capacity: int = 17280):
+        if capacity < 1:
+            raise ValueError(f"Metrics ring capacity must be at least 1, got {capacity}")
+        self.path = path
+        self.capacity = capacity
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+
+    def _size(self, capacity: int) -> int:
+        return self.HEADER.size + capacity * self.RECORD.size
+
+    def open_for_write(self):
+        """Opens (creating or resetting if incompatible) the ring file for recording."""
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        size = self._size(self.capacity)
+        valid = False
+        if os.path.exists(self.path) and os.path.getsize(self.path) == size:
+            with open(self.path, "rb") as f:
+                magic, version, capacity, _, _ = self.HEADER.unpack(f.read(self.HEADER.size))
+            valid = magic == self.MAGIC and version == self.VERSION and capacity == self.capacity
+
+        self._file = open(self.path, "r+b" if valid else "w+b")
+        if not valid:
+            self._file.truncate(size)
+        self._map = mmap.mmap(self._file.fileno(), size)
+        if not valid:
+            self._map[:self.HEADER.size] = self.HEADER.pack(self.MAGIC, self.VERSION, self.capacity, 0, 0)
+
+    def close(self):
+        if self._map is not None:
+            self._map.flush()
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def append(self, sample: Dict[str, Any]):
+        total = self.HEADER.unpack_from(self._map, 0)[4]
+        if total:
+            previous = self.RECORD.unpack_from(self._map, self.HEADER.size + ((total - 1) % self.capacity) * self.RECORD.size)[0]
+            if sample["epoch"] < previous:
+                # The clock went backwards: records are out of order until this one is overwritten
+                struct.pack_into("<I", self._map, self._STEP_OFFSET, (total + 1) & 0xFFFFFFFF)
+        load_avg = sample.get("load_avg")
+        offset = self.HEADER.size + (total % self.capacity) * self.RECORD.size
+        self.RECORD.pack_into(
+            self._map, offset,
+            sample["epoch"],
+            sample["cpu_percent"],
+            sample["memory_percent"],
+            load_avg[0] if load_avg else -1.0,
+        )
+        struct.pack_into("<Q", self._map, self.HEADER.size - 8, total + 1)
+
+    @classmethod
+    def read(cls, path: str, since: float, until: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Returns samples with `since <= epoch < until`, oldest first.
+        Returns an empty list if the file does not exist or is not a ring file.
+        Falls back to a linear filter while a backwards clock step is in the ring.
+        """
+        if not os.path.exists(path) or os.path.getsize(path) < cls.HEADER.size:
+            return []
+
+        with open(path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as ring:
+                magic, version, capacity, step, total = cls.HEADER.unpack_from(ring, 0)
+                if magic != cls.MAGIC or version != cls.VERSION or capacity < 1:
+                    return []
+
+                count = min(total, capacity)
+                first = total - count
+
+                def record(i):
+                    offset = cls.HEADER.size + ((first + i) % capacity) * cls.RECORD.size
+                    return cls.RECORD.unpack_from(ring, offset)
+
+                # A backwards clock step still in the ring breaks the time order
+                ordered = not step or step - 1 < first
+
+                # Binary search for the first record at or after `since`
+                lo, hi = 0, count
+                while ordered and lo < hi:
+                    mid = (lo + hi) // 2
+                    if record(mid)[0] < since:
+                        lo = mid + 1
+                    else:
+                        hi = mid
+
+                samples = []
+                for i in range(lo, count):
+                    epoch, cpu, mem, load = record(i)
+                    if until is not None and epoch >= until:
+                        if ordered:
+                            break
+                        continue
+                    if epoch < since:
+                        # Only reached without the binary search
+                        continue
+                    sample = {
+                        "timestamp": datetime.datetime.fromtimestamp(epoch).strftime("%H:%M:%S"),
+                        "epoch": epoch,
+                        "cpu_percent": round(cpu, 1),
+                        "memory_percent": round(mem, 1),
+                    }
+                    if load >= 0:
+                        sample["load_avg"] = (round(load, 2),)
+                    samples.append(sample)
+                if not ordered:
+                    samples.sort(key=lambda sample: sample["epoch"])
+                return samples
+
+
+class MetricsRecorder:
+    """
+    Samples system performance forever into a MetricsRing.
+    Meant to run in the background (systemd unit, nohup, ...) so that
+    `--monitor --since` has history from before the command was started.
+    """
+    def __init__(self, monitor, path: str, capacity: int):
+        self.monitor = monitor
+        self.ring = MetricsRing(path, capacity)
+
+    def run(self, interval: int = 5):
+        self.ring.open_for_write()
+        # Prime the CPU counter so the first sample covers a real interval
+        self.monitor.take_snapshot()
+        try:
+            while True:
+                time.sleep(interval)
+                try:
+                    self.ring.append(self.monitor.take_snapshot())
+                except Exception:
+                    continue
+        finally:
+            self.ring.close()
@@ -0,0 +1,179 @@
+import mmap
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
+from src.filter import LogFilter
+
+# Bytes a worker reads (and copies out of the map) at a time
+_BLOCK = 8 * 1024 * 1024
+# Per-worker caps that keep partial results compact
+_MAX_OFFSETS = 1000
+_MAX_TEMPLATES = 5000
+
+
+def _scan_range(path: str, start: int, end: int, keywords: Optional[List[str]], exclude: List[str]) -> Dict[str, Any]:
+    """
+    Scans the line-aligned byte range [start, end) of a file. Runs in a
+    worker process, so it returns only counts, line offsets and templates
+    (with the offsets of their first and last occurrence), never lines.
+    """
+    if keywords:
+        pattern = re.compile(b"|".join(re.escape(k.lower().encode("utf-8")) for k in keywords))
+    else:
+        pattern = re.compile(b"^", re.M)
+    excluded = [e.encode("utf-8") for e in exclude if e]
+    result = {"lines": 0, "matched": 0, "ignored": 0, "offsets": [], "templates": {}, "other": 0}
+    templates = result["templates"]
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        position = start
+        while position < end:
+            block_end = min(end, position + _BLOCK)
+            if block_end < end:
+                # Cut blocks at a line boundary
+                newline = mm.rfind(b"\n", position, block_end)
+                block_end = newline + 1 if newline != -1 else end
+            block = mm[position:block_end]
+            result["lines"] += block.count(b"\n") + (0 if block.endswith(b"\n") else 1)
+            lowered = block.lower() if keywords else block
+
+            offset = 0
+            while offset < len(block):
+                match = pattern.search(lowered, offset)
+                if not match:
+                    break
+                line_start = lowered.rfind(b"\n", 0, match.start()) + 1
+                line_end = lowered.find(b"\n", match.end())
+                line_end = len(block) if line_end == -1 else line_end
+                line = block[line_start:line_end]
+                offset = line_end + 1
+                if not line:
+                    continue
+                if any(e in line for e in excluded):
+                    result["ignored"] += 1
+                    continue
+
+                result["matched"] += 1
+                line_offset = position + line_start
+                if len(result["offsets"]) < _MAX_OFFSETS:
+                    result["offsets"].append(line_offset)
+                template = LogFilter.template(line.decode("utf-8", "replace"))
+                entry = templates.get(template)
+                if entry is not None:
+                    entry[0] += 1
+                    entry[2] = line_offset
+                elif len(templates) < _MAX_TEMPLATES:
+                    templates[template] = [1, line_offset, line_offset]
+                else:
+                    result["other"] += 1
+            position = block_end
+    return result
+
+
+class LogScanner:
+    """
+    Full-file scans of large logs on all cores. The file is split into
+    newline-aligned byte ranges that worker processes scan over a shared
+    memory map; their compact partial results (counts, offsets, templates)
+    are merged here. Small files are scanned in-process.
+    """
+    # Below this size a process pool costs more than it saves
+    MIN_PARALLEL_BYTES = 16 * 1024 * 1024
+    # Ranges per worker, so uneven ranges still balance out
+    RANGES_PER_WORKER = 4
+
+    def __init__(self, workers: int = None):
+        self.workers = workers or os.cpu_count() or 1
+
+    @staticmethod
+    def split_ranges(path: str, count: int, start: int = 0, end: int = None) -> List[Tuple[int, int]]:
+        """Splits bytes [start, end) of a file into up to `count` newline-aligned ranges."""
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            end = size if end is None else min(end, size)
+            if end <= start:
+                return []
+            if count <= 1:
+                return [(start, end)]
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                bounds = [start]
+                step = (end - start) // count
+                for i in range(1, count):
+                    newline = mm.find(b"\n", max(start + i * step, bounds[-1]), end)
+                    if newline == -1:
+                        break
+                    if newline + 1 > bounds[-1]:
+                        bounds.append(newline + 1)
+                if bounds[-1] != end:
+                    bounds.append(end)
+        return [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+    @staticmethod
+    def merge(partials: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Combines partial results (in file order) into one."""
+        merged = {"lines": 0, "matched": 0, "ignored": 0, "offsets": [], "templates": {}, "other": 0}
+        for partial in partials:
+            for key in ("lines", "matched", "ignored", "other"):
+                merged[key] += partial[key]
+            merged["offsets"].extend(partial["offsets"])
+            for template, (count, first, last) in partial["templates"].items():
+                entry = merged["templates"].get(template)
+                if entry is None:
+                    merged["templates"][template] = [count, first, last]
+                else:
+                    entry[0] += count
+                    entry[1] = min(entry[1], first)
+                    entry[2] = max(entry[2], last)
+        merged["offsets"] = merged["offsets"][:_MAX_OFFSETS]
+        return merged
+
+    def scan(self, path: str, keywords: Optional[List[str]] = None, exclude: List[str] = None,
+             start: int = 0, end: int = None) -> Dict[str, Any]:
+        """
+        Scans bytes [start, end) of `path` for lines containing a keyword
+        (every line if `keywords` is empty) and none of `exclude`. Returns
+        the merged counts with `templates` as a list of
+        {template, count, first_offset, last_offset}, most frequent first.
+        """
+        size = os.path.getsize(path)
+        end = size if end is None else min(end, size)
+        parallel = self.workers > 1 and end - start >= self.MIN_PARALLEL_BYTES
+        ranges = self.split_ranges(path, self.workers * self.RANGES_PER_WORKER if parallel else 1, start, end)
+        args = (keywords, exclude or [])
+
+        if parallel and len(ranges) > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                partials = list(pool.map(_scan_range, *zip(*[(path, a, b) + args for a, b in ranges])))
+        else:
+            partials = [_scan_range(path, a, b, *args) for a, b in ranges]
+
+        merged = self.merge(partials)
+        merged["path"] = path
+        merged["bytes"] = end - start
+        merged["templates"] = sorted(
+            ({"template": t, "count": c, "first_offset": first, "last_offset": last}
+             for t, (c, first, last) in merged["templates"].items()),
+            key=lambda entry: entry["count"], reverse=True)
+        return merged
+
+    @staticmethod
+    def read_line(path: str, offset: int, max_bytes: int = 4096) -> str:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            return f.read(max_bytes).split(b"\n", 1)[0].decode("utf-8", "replace")
+
+    @staticmethod
+    def representative_lines(result: Dict[str, Any], limit: int = 50) -> str:
+        """
+        One line per template (its latest occurrence) for the `limit` most
+        frequent templates, prefixed with how often it occurred, in file
+        order. This is what gets analyzed instead of the whole file.
+        """
+        top = sorted(result["templates"][:limit], key=lambda entry: entry["last_offset"])
+        lines = []
+        for entry in top:
+            line = LogScanner.read_line(result["path"], entry["last_offset"])
+            prefix = f"[{entry['count']}x] " if entry["count"] > 1 else ""
+            lines.append(prefix + line)
+        return "\n".join(lines)
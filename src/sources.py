@@ -0,0 +1,355 @@
+import glob
+import gzip
+import json
+import os
+import shlex
+import shutil
+import socket
+import subprocess
+import sys
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from src.collector import CollectorError, LogCollector
+from src.correlator import parse_timestamp
+from src.syslog_server import is_syslog_source
+
+
+def select_lines(text: str, lines: int, keywords: List[str] = None, exclude: List[str] = None,
+                 since: float = None, until: float = None) -> str:
+    """
+    The last `lines` lines of `text` that contain a keyword (if given), none
+    of the `exclude` substrings and, with `since`/`until`, a timestamp in
+    that window. Used for sources that cannot filter themselves.
+    """
+    keywords = [k.lower() for k in keywords or []]
+    exclude = [e for e in exclude or [] if e]
+    now = datetime.now()
+    selected = []
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        if keywords and not any(k in line.lower() for k in keywords):
+            continue
+        if any(e in line for e in exclude):
+            continue
+        if since is not None or until is not None:
+            ts = parse_timestamp(line, now)
+            if ts is None or (since is not None and ts < since) or (until is not None and ts >= until):
+                continue
+        selected.append(line)
+    return "\n".join(selected[-lines:])
+
+
+class LogSource(ABC):
+    """
+    A kind of log source. `matches` decides from a source spec (the path or
+    command in COMMON_LOGS / --source) whether this kind handles it; `probe`
+    checks cheaply whether the source exists on this host, returning
+    (available, detail); `collect` returns its lines or a CollectorError,
+    like LogCollector.
+    """
+    kind = "source"
+
+    def __init__(self, spec: str):
+        self.spec = spec
+
+    @classmethod
+    @abstractmethod
+    def matches(cls, spec: str) -> bool:
+        ...
+
+    @abstractmethod
+    def probe(self) -> Tuple[bool, str]:
+        ...
+
+    @abstractmethod
+    def collect(self, lines: int, keywords: List[str] = None, exclude: List[str] = None,
+                since: float = None, until: float = None, **options) -> str:
+        ...
+
+
+class JournalSource(LogSource):
+    """The systemd journal ('journalctl'); priority, unit and keyword filters run in journalctl."""
+    kind = "journal"
+
+    @classmethod
+    def matches(cls, spec: str) -> bool:
+        return spec == "journalctl"
+
+    def probe(self) -> Tuple[bool, str]:
+        if not shutil.which("journalctl"):
+            return False, "journalctl not found"
+        try:
+            version = subprocess.run(["journalctl", "--version"], capture_output=True, text=True, timeout=10).stdout
+        except (OSError, subprocess.SubprocessError) as e:
+            return False, str(e)
+        # --grep needs a journalctl built with PCRE2
+        grep = "+PCRE2" in version
+        return True, "grep" if grep else "no grep"
+
+    def collect(self, lines, keywords=None, exclude=None, since=None, until=None, priority=None, units=None, **options):
+        return LogCollector.get_journal_logs(lines, since=since, until=until, priority=priority,
+                                             units=units, keywords=keywords)
+
+
+class CommandSource(LogSource):
+    """The output of a command, e.g. 'cmd:dmesg --ctime'."""
+    kind = "command"
+    PREFIX = "cmd:"
+    TIMEOUT = 60
+
+    @classmethod
+    def matches(cls, spec: str) -> bool:
+        return spec.startswith(cls.PREFIX)
+
+    @property
+    def argv(self) -> List[str]:
+        return shlex.split(self.spec[len(self.PREFIX):])
+
+    def probe(self) -> Tuple[bool, str]:
+        argv = self.argv
+        if not argv:
+            return False, "empty command"
+        path = shutil.which(argv[0])
+        return (True, path) if path else (False, f"{argv[0]} not found")
+
+    def collect(self, lines, keywords=None, exclude=None, since=None, until=None, **options):
+        try:
+            result = subprocess.run(self.argv, capture_output=True, text=True, timeout=self.TIMEOUT)
+        except FileNotFoundError:
+            return CollectorError(f"Error: command {self.argv[0]} not found.")
+        except subprocess.TimeoutExpired:
+            return CollectorError(f"Error: command {self.spec[len(self.PREFIX):]} timed out after {self.TIMEOUT}s.")
+        if result.returncode != 0 and not result.stdout:
+            return CollectorError(f"Error running {self.spec[len(self.PREFIX):]}: {result.stderr.strip()}")
+        return select_lines(result.stdout, lines, keywords, exclude, since, until)
+
+
+class ContainerSource(LogSource):
+    """
+    A Docker container's JSON log file on disk ('docker:<name or id>'), read
+    directly instead of through `docker logs`.
+    """
+    kind = "container"
+    PREFIX = "docker:"
+    CONTAINERS_DIR = "/var/lib/docker/containers"
+
+    @classmethod
+    def matches(cls, spec: str) -> bool:
+        return spec.startswith(cls.PREFIX)
+
+    def log_file(self) -> Optional[str]:
+        """Path of the container's json-file log, matched by name or id prefix."""
+        wanted = self.spec[len(self.PREFIX):].lstrip("/")
+        try:
+            entries = sorted(os.listdir(self.CONTAINERS_DIR))
+        except OSError:
+            return None
+        for container_id in entries:
+            directory = os.path.join(self.CONTAINERS_DIR, container_id)
+            name = None
+            try:
+                with open(os.path.join(directory, "config.v2.json")) as f:
+                    name = json.load(f).get("Name", "").lstrip("/")
+            except (OSError, ValueError):
+                pass
+            if wanted and (container_id.startswith(wanted) or name == wanted):
+                path = os.path.join(directory, f"{container_id}-json.log")
+                return path if os.path.isfile(path) else None
+        return None
+
+    def probe(self) -> Tuple[bool, str]:
+        if not os.path.isdir(self.CONTAINERS_DIR):
+            return False, f"{self.CONTAINERS_DIR} not found"
+        path = self.log_file()
+        return (True, path) if path else (False, "no json-file log for this container")
+
+    @staticmethod
+    def decode(raw: str) -> str:
+        """Turns json-file records into '<time> <stream>: <message>' lines."""
+        lines = []
+        for record in raw.splitlines():
+            try:
+                entry = json.loads(record)
+            except ValueError:
+                continue
+            lines.append(f"{entry.get('time', '')} {entry.get('stream', '')}: {entry.get('log', '').rstrip()}")
+        return "\n".join(lines)
+
+    def collect(self, lines, keywords=None, exclude=None, since=None, until=None, **options):
+        path = self.log_file()
+        if not path:
+            return CollectorError(f"Error: No log file found for container {self.spec[len(self.PREFIX):]}.")
+        window = since is not None or until is not None
+        # Records are JSON, so timestamps are checked after decoding; with a
+        # window, everything the pre-screen can read is decoded
+        try:
+            raw = LogCollector.tail_matching(path, sys.maxsize if window else lines, keywords, exclude)
+        except OSError as e:
+            return CollectorError(f"Error reading file {path}: {e}")
+        return select_lines(self.decode(raw), lines, keywords, exclude, since, until)
+
+
+class RotatedFileSource(LogSource):
+    """
+    A log file together with its rotations, given as a glob such as
+    '/var/log/syslog*'. Files are read newest first (gzipped ones too)
+    until enough lines are collected; files last written before `since`
+    are not opened.
+    """
+    kind = "rotated"
+
+    @classmethod
+    def matches(cls, spec: str) -> bool:
+        return glob.has_magic(spec)
+
+    def files(self) -> List[str]:
+        paths = [path for path in glob.glob(os.path.expanduser(self.spec)) if os.path.isfile(path)]
+        return sorted(paths, key=os.path.getmtime, reverse=True)
+
+    def probe(self) -> Tuple[bool, str]:
+        files = self.files()
+        readable = [path for path in files if os.access(path, os.R_OK)]
+        if not readable:
+            return False, "no readable files match" if not files else "not readable"
+        return True, f"{len(readable)} file(s)"
+
+    def collect(self, lines, keywords=None, exclude=None, since=None, until=None, **options):
+        chunks = []
+        remaining = lines
+        for path in self.files():
+            if remaining <= 0:
+                break
+            if since is not None and os.path.getmtime(path) < since:
+                break
+            if path.endswith(".gz"):
+                try:
+                    with gzip.open(path, "rt", errors="replace") as f:
+                        logs = select_lines(f.read(), remaining, keywords, exclude, since, until)
+                except OSError as e:
+                    return CollectorError(f"Error reading file {path}: {e}")
+            else:
+                logs = LogCollector.get_file_logs(path, remaining, keywords=keywords, exclude=exclude,
+                                                  since=since, until=until)
+                if isinstance(logs, CollectorError):
+                    return logs
+            logs = [line for line in logs.splitlines() if line.strip()]
+            chunks.append(logs)
+            remaining -= len(logs)
+        # Oldest file first, so lines stay in time order
+        return "\n".join(line for chunk in reversed(chunks) for line in chunk)
+
+
+class FileSource(LogSource):
+    """A plain log file; the fallback for any other spec."""
+    kind = "file"
+
+    @classmethod
+    def matches(cls, spec: str) -> bool:
+        return True
+
+    def probe(self) -> Tuple[bool, str]:
+        path = os.path.expanduser(self.spec)
+        if not os.path.isfile(path):
+            return False, "not found"
+        if not os.access(path, os.R_OK):
+            return False, "not readable"
+        return True, path
+
+    def collect(self, lines, keywords=None, exclude=None, since=None, until=None, **options):
+        return LogCollector.get_file_logs(os.path.expanduser(self.spec), lines, keywords=keywords, exclude=exclude,
+                                          since=since, until=until)
+
+
+class SourceRegistry:
+    """
+    Maps source specs to LogSource kinds (the first whose `matches` accepts
+    the spec) and remembers which sources exist on this host.
+
+    Probe results are kept per hostname in `probe_file` for `ttl` seconds,
+    so `--source all` skips missing sources without touching them, and the
+    journal's --grep support is known before the first query.
+    """
+    KINDS = [JournalSource, CommandSource, ContainerSource, RotatedFileSource, FileSource]
+
+    def __init__(self, probe_file: str = "data/source_probe.json", ttl: int = 3600):
+        self.probe_file = probe_file
+        self.ttl = ttl
+        self.host = socket.gethostname()
+
+    @classmethod
+    def register(cls, kind: type, before: type = FileSource):
+        """Adds a LogSource kind, checked before `before` (by default just before plain files)."""
+        if getattr(kind, "__abstractmethods__", None):
+            raise TypeError(f"{kind.__name__} does not implement {', '.join(sorted(kind.__abstractmethods__))}")
+        cls.KINDS.insert(cls.KINDS.index(before), kind)
+
+    @classmethod
+    def resolve(cls, spec: str) -> LogSource:
+        for kind in cls.KINDS:
+            if kind.matches(spec):
+                return kind(spec)
+        raise ValueError(f"No log source kind handles {spec}")
+
+    def load(self) -> Dict[str, dict]:
+        if not os.path.exists(self.probe_file):
+            return {}
+        try:
+            with open(self.probe_file, 'r') as f:
+                return json.load(f).get(self.host, {})
+        except (json.JSONDecodeError, IOError, AttributeError):
+            return {}
+
+    def save(self, probes: Dict[str, dict]):
+        stored = {}
+        if os.path.exists(self.probe_file):
+            try:
+                with open(self.probe_file, 'r') as f:
+                    stored = json.load(f)
+            except (json.JSONDecodeError, IOError):
+                stored = {}
+        stored[self.host] = probes
+        directory = os.path.dirname(self.probe_file)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        with open(self.probe_file, 'w') as f:
+            json.dump(stored, f, indent=2)
+
+    def probe(self, specs: List[str], refresh: bool = False) -> Dict[str, dict]:
+        """
+        Returns {spec: {"kind", "available", "detail", "checked"}}, probing
+        only specs without a fresh cached result (all of them with `refresh`).
+        """
+        probes = self.load()
+        now = time.time()
+        changed = False
+        for spec in dict.fromkeys(specs):
+            cached = probes.get(spec)
+            if cached and not refresh and now - cached.get("checked", 0) < self.ttl:
+                continue
+            source = self.resolve(spec)
+            try:
+                available, detail = source.probe()
+            except Exception as e:
+                available, detail = False, str(e)
+            probes[spec] = {"kind": source.kind, "available": available, "detail": detail, "checked": now}
+            changed = True
+        if changed:
+            self.save(probes)
+
+        journal = probes.get("journalctl")
+        if journal and journal["available"] and LogCollector.journal_grep is None:
+            LogCollector.journal_grep = journal["detail"] == "grep"
+        return {spec: probes[spec] for spec in specs}
+
+    def available(self, sources: Dict[str, str], refresh: bool = False) -> Tuple[Dict[str, str], Dict[str, dict]]:
+        """
+        Splits {name: spec} into the sources that exist here and the probe
+        results of the others. Syslog listeners are not probed.
+        """
+        probes = self.probe([spec for spec in sources.values() if not is_syslog_source(spec)], refresh)
+        present = {name: spec for name, spec in sources.items() if is_syslog_source(spec) or probes[spec]["available"]}
+        missing = {name: probes[spec] for name, spec in sources.items() if name not in present}
+        return present, missing
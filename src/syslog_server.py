@@ -0,0 +1,192 @@
+import asyncio
+import re
+import socket
+import time
+from typing import Callable, Dict, List, Any, Optional
+from urllib.parse import urlparse
+
+SEVERITIES = ["emergency", "alert", "critical", "error", "warning", "notice", "info", "debug"]
+
+# <PRI>1 TIMESTAMP HOSTNAME APP-NAME PROCID MSGID [SD...] MSG
+_RFC5424_RE = re.compile(
+    r"<(\d{1,3})>1 (\S+) (\S+) (\S+) (\S+) (\S+) (-|(?:\[.*?\])+) ?(.*)", re.S)
+# <PRI>Mmm dd hh:mm:ss HOSTNAME TAG[PID]: MSG
+_RFC3164_RE = re.compile(
+    r"<(\d{1,3})>([A-Z][a-z]{2} [ \d]\d \d{2}:\d{2}:\d{2}) (\S+) ([^\s:\[]+)(?:\[(\d+)\])?:? ?(.*)", re.S)
+_PRI_RE = re.compile(r"<(\d{1,3})>(.*)", re.S)
+
+
+def parse_syslog(message: str) -> Dict[str, Any]:
+    """
+    Parses an RFC 5424 or RFC 3164 syslog message into a record.
+    Messages that match neither keep their text (and PRI, if present).
+    """
+    match = _RFC5424_RE.match(message)
+    if match:
+        pri = int(match.group(1))
+        nil = lambda v: None if v == "-" else v
+        return {
+            "facility": pri >> 3, "severity": pri & 7,
+            "timestamp": nil(match.group(2)), "host": nil(match.group(3)),
+            "app": nil(match.group(4)), "pid": nil(match.group(5)),
+            "message": match.group(8).lstrip("\ufeff").rstrip(),
+        }
+
+    match = _RFC3164_RE.match(message)
+    if match:
+        pri = int(match.group(1))
+        return {
+            "facility": pri >> 3, "severity": pri & 7,
+            "timestamp": match.group(2), "host": match.group(3),
+            "app": match.group(4), "pid": match.group(5),
+            "message": match.group(6).rstrip(),
+        }
+
+    match = _PRI_RE.match(message)
+    pri = int(match.group(1)) if match else 13  # user.notice, as RFC 3164 suggests
+    return {
+        "facility": pri >> 3, "severity": pri & 7,
+        "timestamp": None, "host": None, "app": None, "pid": None,
+        "message": (match.group(2) if match else message).rstrip(),
+    }
+
+
+def format_record(record: Dict[str, Any]) -> str:
+    """
+    Renders a record as a journal-style log line. The severity name is
+    included so priority-based errors also trip the keyword check.
+    """
+    timestamp = record["timestamp"] or time.strftime("%Y-%m-%dT%H:%M:%S")
+    app = record["app"] or "-"
+    if record["pid"]:
+        app = f"{app}[{record['pid']}]"
+    severity = SEVERITIES[record["severity"]] if record["severity"] < len(SEVERITIES) else "unknown"
+    return f"{timestamp} {record['host'] or '-'} {app}: <{severity}> {record['message']}"
+
+
+def parse_address(source_path: str):
+    """
+    Splits 'syslog://host:port' (UDP) or 'syslog+tcp://host:port' into
+    (protocol, host, port). Host defaults to 0.0.0.0 and port to 514.
+    """
+    url = urlparse(source_path)
+    protocol = "tcp" if url.scheme == "syslog+tcp" else "udp"
+    return protocol, url.hostname or "0.0.0.0", url.port or 514
+
+
+def is_syslog_source(source_path: str) -> bool:
+    return source_path.startswith(("syslog://", "syslog+tcp://"))
+
+
+class _UDPProtocol(asyncio.DatagramProtocol):
+    def __init__(self, receiver: "SyslogReceiver"):
+        self.receiver = receiver
+
+    def datagram_received(self, data, addr):
+        # UDP has no way to slow the sender down: when full, drop and count
+        try:
+            self.receiver.queue.put_nowait(data)
+        except asyncio.QueueFull:
+            self.receiver.dropped += 1
+
+
+class SyslogReceiver:
+    """
+    Asyncio syslog listener (UDP or TCP) that hands parsed messages to
+    `on_batch` in batches of up to `batch_size`, or every `batch_interval`
+    seconds. The receive path only enqueues raw bytes; parsing happens per
+    batch. The queue is bounded: TCP readers block on it (which pushes back
+    on senders through the TCP window) and UDP datagrams are dropped.
+    `on_batch` runs in a worker thread, one batch at a time.
+    """
+    RCVBUF = 8 * 1024 * 1024
+
+    def __init__(self, host: str, port: int, protocol: str, on_batch: Callable[[List[Dict[str, Any]]], None],
+                 batch_size: int = 5000, batch_interval: float = 5.0, max_queue: int = 100000):
+        self.host = host
+        self.port = port
+        self.protocol = protocol
+        self.on_batch = on_batch
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.max_queue = max_queue
+        self.queue: Optional[asyncio.Queue] = None
+        self.received = 0
+        self.dropped = 0
+        self._stopping: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def _handle_tcp(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                first = await reader.read(1)
+                if not first:
+                    break
+                if first.isdigit():
+                    # Octet-counting framing (RFC 6587): "<len> <message>"
+                    length = first + await reader.readuntil(b" ")
+                    data = await reader.readexactly(int(length[:-1]))
+                else:
+                    # Non-transparent framing: newline-terminated
+                    data = first + await reader.readuntil(b"\n")
+                await self.queue.put(data)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _batcher(self):
+        loop = asyncio.get_running_loop()
+        while not (self._stopping.is_set() and self.queue.empty()):
+            batch = []
+            deadline = loop.time() + self.batch_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+                # Drain whatever is already queued without awaiting per item
+                while len(batch) < self.batch_size and not self.queue.empty():
+                    batch.append(self.queue.get_nowait())
+            if not batch:
+                continue
+
+            self.received += len(batch)
+            records = [parse_syslog(data.decode("utf-8", "replace").rstrip("\r\n\x00")) for data in batch]
+            await loop.run_in_executor(None, self.on_batch, records)
+
+    async def serve(self):
+        self._loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=self.max_queue)
+        self._stopping = asyncio.Event()
+
+        if self.protocol == "tcp":
+            server = await asyncio.start_server(self._handle_tcp, self.host, self.port)
+            closer = server.close
+        else:
+            family = socket.AF_INET6 if ":" in self.host else socket.AF_INET
+            sock = socket.socket(family, socket.SOCK_DGRAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            # A large kernel buffer absorbs bursts while a batch is being parsed
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.RCVBUF)
+            sock.bind((self.host, self.port))
+            transport, _ = await self._loop.create_datagram_endpoint(lambda: _UDPProtocol(self), sock=sock)
+            closer = transport.close
+
+        batcher = asyncio.ensure_future(self._batcher())
+        try:
+            await self._stopping.wait()
+        finally:
+            closer()
+            await batcher
+
+    def run(self):
+        """Serves until `stop` is called (from any thread) or the process is interrupted."""
+        asyncio.run(self.serve())
+
+    def stop(self):
+        if self._loop is not None and self._stopping is not None:
+            self._loop.call_soon_threadsafe(self._stopping.set)
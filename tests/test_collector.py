@@ -0,0 +1,44 @@
+import os
+import tempfile
+import time
+import unittest
+from datetime import datetime
+from src.collector import CollectorError, LogCollector
+
+
+class TimeWindowTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+
+    def write(self, name: str, lines) -> str:
+        path = os.path.join(self.dir.name, name)
+        with open(path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        return path
+
+    def test_window_of_timestamped_file(self):
+        base = datetime(2026, 10, 19, 10, 0, 0)
+        path = self.write("app.log", [f"{base.replace(minute=m).isoformat()} error {m}" for m in range(60)])
+        since = base.replace(minute=20).timestamp()
+        # --until is inclusive, like journalctl's
+        until = base.replace(minute=30).timestamp()
+
+        logs = LogCollector.get_file_logs(path, 100, keywords=["error"], since=since, until=until)
+        self.assertNotIsInstance(logs, CollectorError)
+        self.assertEqual([line.split()[-1] for line in logs.splitlines()], [str(m) for m in range(20, 31)])
+
+    def test_file_without_timestamps_is_an_error(self):
+        path = self.write("plain.log", [f"error number {i}" for i in range(5000)])
+
+        logs = LogCollector.get_file_logs(path, 50, keywords=["error"], since=time.time() - 3600)
+        self.assertIsInstance(logs, CollectorError)
+        self.assertIn("no parseable timestamps", logs)
+        self.assertIn("--since/--until unsupported", logs)
+
+        with self.assertRaises(ValueError):
+            LogCollector.time_range(path, until=time.time())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import os
+import tempfile
+import unittest
+from src.recorder import MetricsRing
+
+
+class MetricsRingTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.path = os.path.join(self.dir.name, "metrics.ring")
+
+    def record(self, capacity, epochs):
+        ring = MetricsRing(self.path, capacity)
+        ring.open_for_write()
+        try:
+            for epoch in epochs:
+                ring.append({"epoch": epoch, "cpu_percent": 1.0, "memory_percent": 2.0})
+        finally:
+            ring.close()
+
+    def epochs(self, since, until=None):
+        return [sample["epoch"] for sample in MetricsRing.read(self.path, since, until)]
+
+    def test_capacity_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            MetricsRing(self.path, 0)
+
+    def test_window_after_wrapping(self):
+        self.record(10, range(100, 125))
+        self.assertEqual(self.epochs(0), list(range(115, 125)))
+        self.assertEqual(self.epochs(118, 121), [118, 119, 120])
+
+    def test_backwards_clock_step(self):
+        # The clock is stepped back by 50s after the sample at 130
+        self.record(100, [100, 110, 120, 130, 85, 95, 105, 115])
+        self.assertEqual(self.epochs(100, 120), [100, 105, 110, 115])
+        self.assertEqual(self.epochs(90), [95, 100, 105, 110, 115, 120, 130])
+
+    def test_binary_search_again_once_step_is_overwritten(self):
+        self.record(4, [100, 110, 90, 120, 130, 140, 150])
+        self.assertEqual(self.epochs(125), [130, 140, 150])
+
+
+if __name__ == "__main__":
+    unittest.main()
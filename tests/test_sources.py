@@ -0,0 +1,67 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from src.correlator import parse_timestamp
+from src.sources import ContainerSource, LogSource, SourceRegistry
+
+
+class ContainerSourceTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.containers_dir = ContainerSource.CONTAINERS_DIR
+        ContainerSource.CONTAINERS_DIR = self.dir.name
+        self.addCleanup(setattr, ContainerSource, "CONTAINERS_DIR", self.containers_dir)
+
+    def write_container(self, container_id: str, name: str, records):
+        directory = os.path.join(self.dir.name, container_id)
+        os.makedirs(directory)
+        with open(os.path.join(directory, "config.v2.json"), "w") as f:
+            json.dump({"Name": f"/{name}"}, f)
+        with open(os.path.join(directory, f"{container_id}-json.log"), "w") as f:
+            for time, message in records:
+                f.write(json.dumps({"log": message + "\n", "stream": "stderr", "time": time}) + "\n")
+
+    def test_nanosecond_timestamps(self):
+        # Docker's json-file driver writes RFC3339Nano
+        self.assertEqual(parse_timestamp("2026-10-19T10:22:01.123456789Z"),
+                         datetime(2026, 10, 19, 10, 22, 1, 123456, tzinfo=timezone.utc).timestamp())
+        self.assertEqual(parse_timestamp("2026-10-19T10:22:01.5Z"),
+                         datetime(2026, 10, 19, 10, 22, 1, 500000, tzinfo=timezone.utc).timestamp())
+
+    def test_window_over_nanosecond_records(self):
+        self.write_container("abc123", "web", [
+            ("2026-10-19T10:00:00.100200300Z", "error: before"),
+            ("2026-10-19T10:05:00.987654321Z", "error: inside"),
+            ("2026-10-19T10:10:00.000000001Z", "error: after"),
+        ])
+        since = datetime(2026, 10, 19, 10, 1, tzinfo=timezone.utc).timestamp()
+        until = datetime(2026, 10, 19, 10, 9, tzinfo=timezone.utc).timestamp()
+
+        logs = ContainerSource("docker:web").collect(50, ["error"], since=since, until=until)
+        self.assertEqual(logs, "2026-10-19T10:05:00.987654321Z stderr: error: inside")
+
+
+class SourceRegistryTest(unittest.TestCase):
+    def test_incomplete_kind_is_rejected(self):
+        class NoCollect(LogSource):
+            kind = "partial"
+
+            @classmethod
+            def matches(cls, spec):
+                return spec.startswith("partial:")
+
+            def probe(self):
+                return True, ""
+
+        with self.assertRaises(TypeError):
+            SourceRegistry.register(NoCollect)
+        with self.assertRaises(TypeError):
+            NoCollect("partial:x")
+        self.assertNotIn(NoCollect, SourceRegistry.KINDS)
+
+
+if __name__ == "__main__":
+    unittest.main()